@@ -12,6 +12,20 @@
 // Emit dispatches by the concrete type of the event value:
 //
 //	b.Emit(events.StateStarted{...})
+//
+// Observers that handle many event types register them in one call with
+// SubscribeAll, which takes the lock once and returns a single cancel:
+//
+//	cancel := bus.SubscribeAll(b,
+//		bus.On(o.onStateStarted),
+//		bus.On(o.onStateCompleted),
+//	)
+//
+// The bus holds strong references to its handlers. Callers rely on this:
+// observers are commonly created inside RunOptions.ObserverSetup and their
+// constructor results discarded, so the bus subscription is the only thing
+// keeping them alive for the duration of the run. Handlers are released when
+// cancelled, when Clear is called, or when the Bus itself becomes unreachable.
 package bus
 
 import (
@@ -23,7 +37,10 @@ import (
 // Bus is a synchronous publish/subscribe event dispatcher.
 // The zero value is not usable; create with New.
 type Bus struct {
-	mu       sync.Mutex
+	mu sync.Mutex
+	// handlers slices are copy-on-write: registration and cancellation always
+	// build a new slice, so a slice obtained under mu is never modified
+	// afterwards and Emit can dispatch from it after releasing the lock.
 	handlers map[reflect.Type][]*entry
 	nextID   uint64
 }
@@ -42,23 +59,57 @@ func New() *Bus {
 // function. Calling cancel removes the handler; calling it more than once
 // is safe (idempotent).
 func Subscribe[T any](b *Bus, handler func(T)) func() {
-	t := reflect.TypeOf((*T)(nil)).Elem()
-	e := &entry{fn: func(v any) { handler(v.(T)) }}
+	return SubscribeAll(b, On(handler))
+}
+
+// Subscription is a typed handler prepared for registration by SubscribeAll.
+// Create one with On.
+type Subscription struct {
+	t  reflect.Type
+	fn func(any)
+}
+
+// On prepares handler for events of type T for registration by SubscribeAll.
+func On[T any](handler func(T)) Subscription {
+	return Subscription{
+		t:  reflect.TypeOf((*T)(nil)).Elem(),
+		fn: func(v any) { handler(v.(T)) },
+	}
+}
+
+// SubscribeAll registers every subscription under a single lock acquisition
+// and returns one cancel function that removes them all, again under a
+// single lock. Calling cancel more than once is safe (idempotent).
+func SubscribeAll(b *Bus, subs ...Subscription) func() {
+	type registered struct {
+		t  reflect.Type
+		id uint64
+	}
+	regs := make([]registered, len(subs))
 
 	b.mu.Lock()
-	b.nextID++
-	e.id = b.nextID
-	b.handlers[t] = append(b.handlers[t], e)
+	for i, s := range subs {
+		b.nextID++
+		e := &entry{id: b.nextID, fn: s.fn}
+		// Clip capacity so append copies instead of writing into a slice an
+		// in-flight Emit may still be iterating.
+		entries := b.handlers[s.t]
+		b.handlers[s.t] = append(entries[:len(entries):len(entries)], e)
+		regs[i] = registered{t: s.t, id: e.id}
+	}
 	b.mu.Unlock()
 
 	return func() {
 		b.mu.Lock()
 		defer b.mu.Unlock()
-		entries := b.handlers[t]
-		for i, h := range entries {
-			if h.id == e.id {
-				b.handlers[t] = append(entries[:i], entries[i+1:]...)
-				return
+		for _, r := range regs {
+			entries := b.handlers[r.t]
+			for i, h := range entries {
+				if h.id == r.id {
+					// Copy-on-write, as in registration above.
+					b.handlers[r.t] = append(entries[:i:i], entries[i+1:]...)
+					break
+				}
 			}
 		}
 	}
@@ -71,13 +122,14 @@ func (b *Bus) Emit(event any) {
 	t := reflect.TypeOf(event)
 
 	b.mu.Lock()
-	// Copy the slice so we can release the lock before calling handlers.
-	// This prevents deadlock if a handler itself calls Emit or Subscribe.
-	snapshot := make([]*entry, len(b.handlers[t]))
-	copy(snapshot, b.handlers[t])
+	// Handler slices are copy-on-write, so this one stays valid after the
+	// lock is released without taking a per-event copy. Releasing the lock
+	// before calling handlers prevents deadlock if a handler itself calls
+	// Emit or Subscribe.
+	handlers := b.handlers[t]
 	b.mu.Unlock()
 
-	for _, e := range snapshot {
+	for _, e := range handlers {
 		safeCall(e.fn, event)
 	}
 }
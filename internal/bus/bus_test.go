@@ -1,7 +1,10 @@
 package bus_test
 
 import (
+	"runtime"
+	"sync/atomic"
 	"testing"
+	"time"
 
 	"github.com/stretchr/testify/assert"
 	"github.com/vector76/raymond/internal/bus"
@@ -150,6 +153,33 @@ func TestPanicDoesNotPropagateToEmitCaller(t *testing.T) {
 // HasHandlers
 // ----------------------------------------------------------------------------
 
+// TestChangesDuringEmitApplyFromNextEvent verifies that a handler that
+// subscribes or cancels while an event is being dispatched does not change
+// which handlers receive that event, only the events emitted afterwards.
+func TestChangesDuringEmitApplyFromNextEvent(t *testing.T) {
+	b := bus.New()
+	var calls []string
+	var cancelB func()
+
+	bus.Subscribe(b, func(e events.StateStarted) {
+		calls = append(calls, "a:"+e.StateName)
+		if e.StateName == "FIRST.md" {
+			cancelB()
+			bus.Subscribe(b, func(e events.StateStarted) {
+				calls = append(calls, "c:"+e.StateName)
+			})
+		}
+	})
+	cancelB = bus.Subscribe(b, func(e events.StateStarted) {
+		calls = append(calls, "b:"+e.StateName)
+	})
+
+	b.Emit(makeStarted("FIRST.md"))
+	b.Emit(makeStarted("SECOND.md"))
+
+	assert.Equal(t, []string{"a:FIRST.md", "b:FIRST.md", "a:SECOND.md", "c:SECOND.md"}, calls)
+}
+
 func TestHasHandlersTrue(t *testing.T) {
 	b := bus.New()
 	bus.Subscribe(b, func(e events.StateStarted) {})
@@ -229,3 +259,73 @@ func TestSameHandlerOnMultipleTypes(t *testing.T) {
 	assert.IsType(t, events.StateStarted{}, allEvents[0])
 	assert.IsType(t, events.ErrorOccurred{}, allEvents[1])
 }
+
+// ----------------------------------------------------------------------------
+// SubscribeAll
+// ----------------------------------------------------------------------------
+
+func TestSubscribeAllDeliversEachType(t *testing.T) {
+	b := bus.New()
+	var started, completed int
+
+	bus.SubscribeAll(b,
+		bus.On(func(e events.StateStarted) { started++ }),
+		bus.On(func(e events.StateCompleted) { completed++ }),
+	)
+
+	b.Emit(makeStarted("START.md"))
+	b.Emit(makeCompleted("START.md"))
+	b.Emit(makeCompleted("START.md"))
+
+	assert.Equal(t, 1, started)
+	assert.Equal(t, 2, completed)
+}
+
+func TestSubscribeAllCancelRemovesOnlyItsHandlers(t *testing.T) {
+	b := bus.New()
+	var group, other int
+
+	cancel := bus.SubscribeAll(b,
+		bus.On(func(e events.StateStarted) { group++ }),
+		bus.On(func(e events.StateCompleted) { group++ }),
+	)
+	bus.Subscribe(b, func(e events.StateStarted) { other++ })
+
+	cancel()
+	cancel() // idempotent
+
+	b.Emit(makeStarted("START.md"))
+	b.Emit(makeCompleted("START.md"))
+
+	assert.Equal(t, 0, group)
+	assert.Equal(t, 1, other)
+	assert.False(t, bus.HasHandlers[events.StateCompleted](b))
+}
+
+// ownedObserver is a handler owner reachable only through the method value
+// it subscribes.
+type ownedObserver struct{ hits int }
+
+func (o *ownedObserver) onStarted(events.StateStarted) { o.hits++ }
+
+// TestHandlerOwnerKeptAliveByBus verifies that a subscribed handler keeps its
+// receiver reachable: observers are routinely constructed without the caller
+// retaining a reference, relying on the bus to keep them alive.
+func TestHandlerOwnerKeptAliveByBus(t *testing.T) {
+	b := bus.New()
+	var collected atomic.Bool
+
+	func() {
+		obs := &ownedObserver{}
+		runtime.SetFinalizer(obs, func(*ownedObserver) { collected.Store(true) })
+		bus.Subscribe(b, obs.onStarted)
+	}()
+	for i := 0; i < 3; i++ {
+		runtime.GC()
+	}
+	// Finalizers run on their own goroutine; give a queued one time to run.
+	time.Sleep(10 * time.Millisecond)
+
+	assert.False(t, collected.Load(), "handler owner was collected while subscribed")
+	b.Emit(makeStarted("START.md"))
+}
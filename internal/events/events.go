@@ -63,6 +63,15 @@ type WorkflowResuming struct {
 	Timestamp  time.Time
 }
 
+// WorkflowEnded is emitted when a run that emitted WorkflowStarted returns,
+// however it ends: after WorkflowCompleted or WorkflowPaused, and also on
+// fatal errors and cancellation, which emit neither. It is the last event of
+// the run.
+type WorkflowEnded struct {
+	WorkflowID string
+	Timestamp  time.Time
+}
+
 // StateStarted is emitted when an agent begins executing a state.
 type StateStarted struct {
 	AgentID   string
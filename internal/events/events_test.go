@@ -79,6 +79,15 @@ func TestWorkflowResumingConstruction(t *testing.T) {
 	assert.Equal(t, "test-001", e.WorkflowID)
 }
 
+func TestWorkflowEndedConstruction(t *testing.T) {
+	e := events.WorkflowEnded{
+		WorkflowID: "test-001",
+		Timestamp:  time.Now(),
+	}
+	assert.Equal(t, "test-001", e.WorkflowID)
+	assert.False(t, e.Timestamp.IsZero())
+}
+
 // ----------------------------------------------------------------------------
 // State execution events
 // ----------------------------------------------------------------------------
@@ -1233,6 +1233,7 @@ func TestMarkdownExecutor_WritesJSONLDebugFile(t *testing.T) {
 		t.Fatalf("Execute error: %v", err)
 	}
 
+	obs.Flush()
 	jsonlFiles, _ := filepath.Glob(filepath.Join(debugDir, "*.jsonl"))
 	if len(jsonlFiles) != 1 {
 		t.Fatalf("expected 1 JSONL file, got %d", len(jsonlFiles))
@@ -233,10 +233,11 @@ func (e *ScriptExecutor) saveDebugFiles(
 	executionTimeMS float64,
 	envVars map[string]string,
 ) {
-	base := fmt.Sprintf("%s_%s_%03d", agentID, stateName, stepNumber)
+	// Join once; the three files differ only in suffix.
+	base := filepath.Join(debugDir, fmt.Sprintf("%s_%s_%03d", agentID, stateName, stepNumber))
 
-	writeDebugFile(filepath.Join(debugDir, base+".stdout.txt"), stdout)
-	writeDebugFile(filepath.Join(debugDir, base+".stderr.txt"), stderr)
+	writeDebugFile(base+".stdout.txt", stdout)
+	writeDebugFile(base+".stderr.txt", stderr)
 
 	meta := map[string]any{
 		"exit_code":         exitCode,
@@ -245,13 +246,20 @@ func (e *ScriptExecutor) saveDebugFiles(
 	}
 	data, err := json.MarshalIndent(meta, "", "  ")
 	if err == nil {
-		writeDebugFile(filepath.Join(debugDir, base+".meta.json"), string(data))
+		writeDebugFile(base+".meta.json", string(data))
 	}
 }
 
 // writeDebugFile writes content to path, silently ignoring errors.
+// Script output can be large, so content is written straight from the string
+// with WriteString rather than first copied into a []byte for os.WriteFile.
 func writeDebugFile(path, content string) {
-	_ = os.WriteFile(path, []byte(content), 0o600)
+	f, err := os.OpenFile(path, os.O_WRONLY|os.O_CREATE|os.O_TRUNC, 0o600)
+	if err != nil {
+		return
+	}
+	_, _ = f.WriteString(content)
+	_ = f.Close()
 }
 
 // sessionIDStr returns the string value of a *string or "" if nil.
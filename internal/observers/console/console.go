@@ -236,10 +236,20 @@ func (r *ConsoleReporter) formatAgentID(agentID string) string {
 }
 
 // --- event handlers (called from ConsoleObserver subscriptions) ---
+//
+// Every handler below runs with r.mu held: NewWithWriter wraps each one with
+// locked, so the bodies contain only formatting logic.
+
+// locked adapts a reporter handler into a bus handler that runs it under r.mu.
+func locked[T any](r *ConsoleReporter, fn func(T)) func(T) {
+	return func(e T) {
+		r.mu.Lock()
+		defer r.mu.Unlock()
+		fn(e)
+	}
+}
 
 func (r *ConsoleReporter) onWorkflowStarted(e events.WorkflowStarted) {
-	r.mu.Lock()
-	defer r.mu.Unlock()
 	ts := e.Timestamp.Format("15:04:05")
 	fmt.Fprintf(r.w, "[%s] Workflow: %s\n", ts, e.WorkflowID)
 	fmt.Fprintf(r.w, "[%s] Scope: %s\n", ts, e.ScopeDir)
@@ -249,21 +259,15 @@ func (r *ConsoleReporter) onWorkflowStarted(e events.WorkflowStarted) {
 }
 
 func (r *ConsoleReporter) onWorkflowCompleted(e events.WorkflowCompleted) {
-	r.mu.Lock()
-	defer r.mu.Unlock()
 	fmt.Fprintf(r.w, "Workflow completed. Total cost: $%.4f\n", e.TotalCostUSD)
 }
 
 func (r *ConsoleReporter) onWorkflowPaused(e events.WorkflowPaused) {
-	r.mu.Lock()
-	defer r.mu.Unlock()
 	fmt.Fprintf(r.w, "Workflow paused. %d agent(s) paused. Total cost: $%.4f\n",
 		e.PausedAgentCount, e.TotalCostUSD)
 }
 
 func (r *ConsoleReporter) onWorkflowWaiting(e events.WorkflowWaiting) {
-	r.mu.Lock()
-	defer r.mu.Unlock()
 	if r.color {
 		fmt.Fprintf(r.w, "%sUsage limit reached. Waiting %.0f seconds before resuming.%s\n",
 			colorWarning, e.WaitSeconds, colorReset)
@@ -273,14 +277,10 @@ func (r *ConsoleReporter) onWorkflowWaiting(e events.WorkflowWaiting) {
 }
 
 func (r *ConsoleReporter) onWorkflowResuming(e events.WorkflowResuming) {
-	r.mu.Lock()
-	defer r.mu.Unlock()
 	fmt.Fprintf(r.w, "Resuming workflow.\n")
 }
 
 func (r *ConsoleReporter) onStateStarted(e events.StateStarted) {
-	r.mu.Lock()
-	defer r.mu.Unlock()
 	r.lastStateType[e.AgentID] = e.StateType
 	fmt.Fprintf(r.w, "%s %s\n", r.formatAgentID(e.AgentID), e.StateName)
 	if e.StateType == events.StateTypeScript && !r.quiet {
@@ -289,8 +289,6 @@ func (r *ConsoleReporter) onStateStarted(e events.StateStarted) {
 }
 
 func (r *ConsoleReporter) onStateCompleted(e events.StateCompleted) {
-	r.mu.Lock()
-	defer r.mu.Unlock()
 	stateType := r.lastStateType[e.AgentID]
 	if stateType == events.StateTypeScript {
 		exitCode := r.lastExitCode[e.AgentID]
@@ -315,15 +313,11 @@ func (r *ConsoleReporter) onProgressMessage(e events.ProgressMessage) {
 	if r.quiet {
 		return
 	}
-	r.mu.Lock()
-	defer r.mu.Unlock()
 	msg := truncateMessage(e.Message, r.availableWidth(prefixTreeBranch))
 	fmt.Fprintf(r.w, "  %s %s\n", r.colorToken(e.AgentID, r.sym.progress), msg)
 }
 
 func (r *ConsoleReporter) onToolInvocation(e events.ToolInvocation) {
-	r.mu.Lock()
-	defer r.mu.Unlock()
 	r.lastTool[e.AgentID] = e.ToolName
 	if r.quiet {
 		return
@@ -339,14 +333,10 @@ func (r *ConsoleReporter) onToolInvocation(e events.ToolInvocation) {
 }
 
 func (r *ConsoleReporter) onScriptOutput(e events.ScriptOutput) {
-	r.mu.Lock()
-	defer r.mu.Unlock()
 	r.lastExitCode[e.AgentID] = e.ExitCode
 }
 
 func (r *ConsoleReporter) onPrintOutput(e events.PrintOutput) {
-	r.mu.Lock()
-	defer r.mu.Unlock()
 	content := e.Content
 	if len(content) == 0 || content[len(content)-1] != '\n' {
 		content += "\n"
@@ -355,9 +345,6 @@ func (r *ConsoleReporter) onPrintOutput(e events.PrintOutput) {
 }
 
 func (r *ConsoleReporter) onTransitionOccurred(e events.TransitionOccurred) {
-	r.mu.Lock()
-	defer r.mu.Unlock()
-
 	switch {
 	case e.ToState == "":
 		// Agent termination — displayed by onAgentTerminated; skip here.
@@ -387,16 +374,12 @@ func (r *ConsoleReporter) onTransitionOccurred(e events.TransitionOccurred) {
 }
 
 func (r *ConsoleReporter) onAgentSpawned(e events.AgentSpawned) {
-	r.mu.Lock()
-	defer r.mu.Unlock()
 	// ⑂ WORKER.md → main_worker1
 	fmt.Fprintf(r.w, "  %s %s %s %s\n",
 		r.colorToken(e.ParentAgentID, r.sym.fork), e.InitialState, r.sym.forkArrow, e.NewAgentID)
 }
 
 func (r *ConsoleReporter) onAgentTerminated(e events.AgentTerminated) {
-	r.mu.Lock()
-	defer r.mu.Unlock()
 	payload := strings.TrimSpace(e.ResultPayload)
 	if payload != "" {
 		truncated := truncateMessage(payload, r.availableWidth(prefixResult))
@@ -408,24 +391,23 @@ func (r *ConsoleReporter) onAgentTerminated(e events.AgentTerminated) {
 }
 
 func (r *ConsoleReporter) onErrorOccurred(e events.ErrorOccurred) {
-	r.mu.Lock()
-	defer r.mu.Unlock()
 	// Prefix: "  ! " = 4 chars (before color codes, which are zero-width)
 	msg := truncateMessage(e.ErrorMessage, r.availableWidth(4))
+	// Color codes are passed as format operands so the line is composed in a
+	// single formatting pass; the retry suffix is only formatted when retryable.
+	on, off := "", ""
 	if r.color {
-		msg = colorError + msg + colorReset
+		on, off = colorError, colorReset
 	}
 	if e.IsRetryable {
-		fmt.Fprintf(r.w, "  %s %s - retrying (%d/%d)\n",
-			r.sym.warn, msg, e.RetryCount, e.MaxRetries)
+		fmt.Fprintf(r.w, "  %s %s%s%s - retrying (%d/%d)\n",
+			r.sym.warn, on, msg, off, e.RetryCount, e.MaxRetries)
 	} else {
-		fmt.Fprintf(r.w, "  %s %s\n", r.sym.warn, msg)
+		fmt.Fprintf(r.w, "  %s %s%s%s\n", r.sym.warn, on, msg, off)
 	}
 }
 
 func (r *ConsoleReporter) onAgentPaused(e events.AgentPaused) {
-	r.mu.Lock()
-	defer r.mu.Unlock()
 	reason := e.Reason
 	if r.color {
 		reason = colorWarning + reason + colorReset
@@ -434,8 +416,6 @@ func (r *ConsoleReporter) onAgentPaused(e events.AgentPaused) {
 }
 
 func (r *ConsoleReporter) onAgentAskStarted(e events.AgentAskStarted) {
-	r.mu.Lock()
-	defer r.mu.Unlock()
 	prompt := firstLine(e.Prompt)
 	// Prefix: "  ├─ [agentID] asking human input: " = 30 + len(agentID)
 	prefixLen := 30 + len(e.AgentID)
@@ -445,8 +425,6 @@ func (r *ConsoleReporter) onAgentAskStarted(e events.AgentAskStarted) {
 }
 
 func (r *ConsoleReporter) onAgentAskResumed(e events.AgentAskResumed) {
-	r.mu.Lock()
-	defer r.mu.Unlock()
 	fmt.Fprintf(r.w, "  %s %s input received, resuming\n",
 		r.colorToken(e.AgentID, r.sym.progress), r.formatAgentID(e.AgentID))
 }
@@ -492,7 +470,7 @@ func returnSnippet(payload string) string {
 // output via a ConsoleReporter.
 type ConsoleObserver struct {
 	reporter *ConsoleReporter
-	cancels  []func()
+	cancel   func()
 }
 
 // New creates a ConsoleObserver writing to os.Stdout. Unicode symbols and ANSI
@@ -509,35 +487,41 @@ func New(b *bus.Bus, quiet bool, width int) *ConsoleObserver {
 func NewWithWriter(b *bus.Bus, quiet bool, width int, w io.Writer, unicode, color bool) *ConsoleObserver {
 	r := newReporter(w, quiet, unicode, color, width)
 	o := &ConsoleObserver{reporter: r}
-	o.cancels = []func(){
-		bus.Subscribe(b, r.onWorkflowStarted),
-		bus.Subscribe(b, r.onWorkflowCompleted),
-		bus.Subscribe(b, r.onWorkflowPaused),
-		bus.Subscribe(b, r.onWorkflowWaiting),
-		bus.Subscribe(b, r.onWorkflowResuming),
-		bus.Subscribe(b, r.onStateStarted),
-		bus.Subscribe(b, r.onStateCompleted),
-		bus.Subscribe(b, r.onProgressMessage),
-		bus.Subscribe(b, r.onToolInvocation),
-		bus.Subscribe(b, r.onScriptOutput),
-		bus.Subscribe(b, r.onTransitionOccurred),
-		bus.Subscribe(b, r.onAgentSpawned),
-		bus.Subscribe(b, r.onAgentTerminated),
-		bus.Subscribe(b, r.onErrorOccurred),
-		bus.Subscribe(b, r.onAgentPaused),
-		bus.Subscribe(b, r.onAgentAskStarted),
-		bus.Subscribe(b, r.onAgentAskResumed),
-		bus.Subscribe(b, r.onPrintOutput),
-	}
+	subs := []bus.Subscription{
+		bus.On(locked(r, r.onWorkflowStarted)),
+		bus.On(locked(r, r.onWorkflowCompleted)),
+		bus.On(locked(r, r.onWorkflowPaused)),
+		bus.On(locked(r, r.onWorkflowWaiting)),
+		bus.On(locked(r, r.onWorkflowResuming)),
+		bus.On(locked(r, r.onStateStarted)),
+		bus.On(locked(r, r.onStateCompleted)),
+		bus.On(locked(r, r.onToolInvocation)),
+		bus.On(locked(r, r.onScriptOutput)),
+		bus.On(locked(r, r.onTransitionOccurred)),
+		bus.On(locked(r, r.onAgentSpawned)),
+		bus.On(locked(r, r.onAgentTerminated)),
+		bus.On(locked(r, r.onErrorOccurred)),
+		bus.On(locked(r, r.onAgentPaused)),
+		bus.On(locked(r, r.onAgentAskStarted)),
+		bus.On(locked(r, r.onAgentAskResumed)),
+		bus.On(locked(r, r.onPrintOutput)),
+	}
+	// Progress messages are never shown in quiet mode, so skip the
+	// subscription entirely rather than dispatching each event to a handler
+	// that would discard it.
+	if !quiet {
+		subs = append(subs, bus.On(locked(r, r.onProgressMessage)))
+	}
+	o.cancel = bus.SubscribeAll(b, subs...)
 	return o
 }
 
 // Close unregisters all bus subscriptions.
 func (o *ConsoleObserver) Close() {
-	for _, cancel := range o.cancels {
-		cancel()
+	if o.cancel != nil {
+		o.cancel()
+		o.cancel = nil
 	}
-	o.cancels = nil
 }
 
 // isCharDevice reports whether f is a character device (i.e. a terminal).
@@ -11,46 +11,138 @@
 // set by the orchestrator. When DebugDir is empty (debug disabled) the
 // observer is a no-op.
 //
+// Stream lines are batched per agent and queued for writing when a batch
+// reaches maxBatchLines, when it has been pending for maxBatchAge, when the
+// agent's state completes or errors, when the workflow completes, pauses or
+// ends, and on Flush or Close. The age bound is enforced by a timer armed when a
+// batch starts, so a quiet agent's last lines do not wait for its next one.
+//
+// Disk I/O happens off the emitting goroutine: handlers only format and
+// queue, and a single writer goroutine performs the writes in queue order.
+// The writer is started on demand and exits as soon as the queue is empty, so
+// an observer that is never closed leaves nothing running. Handlers for
+// ErrorOccurred, WorkflowCompleted, WorkflowPaused and WorkflowEnded wait for
+// the writes queued before the event so that the record is on disk before the
+// process may exit; later writes from agents that keep streaming do not hold
+// them up. WorkflowEnded is emitted on every exit from a run, including fatal
+// errors and cancellation, so nothing is left buffered or held open when the
+// observer itself is never closed.
+//
+// transitions.log is held open by the writer across events rather than
+// reopened per transition. The handle is released when the run ends and on
+// Close; it is reopened lazily if further transitions arrive.
+//
 // File I/O errors are written to stderr so that debug output failures are
 // visible to the developer, while workflow execution continues uninterrupted.
 package debug
 
 import (
+	"bytes"
 	"encoding/json"
 	"fmt"
 	"os"
 	"path/filepath"
-	"strings"
 	"sync"
+	"time"
 
 	"github.com/vector76/raymond/internal/bus"
 	"github.com/vector76/raymond/internal/events"
+	"github.com/vector76/raymond/internal/parsing"
+)
+
+// Batch bounds for buffered ClaudeStreamOutput lines.
+const (
+	maxBatchLines = 64
+	maxBatchAge   = 50 * time.Millisecond
 )
 
 // DebugObserver writes JSONL step files and a transitions log.
 type DebugObserver struct {
 	mu       sync.Mutex
-	debugDir string // set by WorkflowStarted; empty = no-op
-	cancels  []func()
+	debugDir string              // set by WorkflowStarted; empty = no-op
+	pending  map[string]*stepLog // buffered stream lines keyed by agent ID
+	queue    []writeJob          // writes awaiting the writer goroutine
+	writing  bool                // a writer goroutine is running
+	queued   uint64              // jobs ever enqueued
+	written  uint64              // jobs the writer has finished
+	progress *sync.Cond          // on mu; broadcast when written advances
+	cancel   func()
+
+	// Owned by the writer goroutine; only one runs at a time.
+	transitionsLog *os.File // open transitions.log handle; nil until first use
+}
+
+// stepLog holds the stream lines buffered for one agent's current step file.
+type stepLog struct {
+	stateName string // state the cached stem and path were derived from
+	stem      string // stateName with its extension stripped
+	step      int    // step number the cached path was derived from
+
+	path  string
+	buf   bytes.Buffer
+	enc   *json.Encoder // encodes into buf
+	lines int
+	timer *time.Timer // flushes the batch maxBatchAge after its first line
+}
+
+// newStepLog returns an empty stepLog with its encoder bound to buf.
+// HTML escaping is disabled: stream objects are full of transition tags, and
+// \u003c-style escapes only cost time and make the files harder to read.
+func newStepLog() *stepLog {
+	sl := &stepLog{}
+	sl.enc = json.NewEncoder(&sl.buf)
+	sl.enc.SetEscapeHTML(false)
+	return sl
+}
+
+// writeJob is one unit of work for the writer goroutine.
+type writeJob struct {
+	path        string
+	data        []byte
+	transitions bool // append data to the held-open transitions.log at path
+	closeLog    bool // release the transitions.log handle
+	merged      int  // queued jobs this one stands for; set by coalesce
 }
 
 // New creates a DebugObserver subscribed to b.
 func New(b *bus.Bus) *DebugObserver {
-	o := &DebugObserver{}
-	o.cancels = []func(){
-		bus.Subscribe(b, o.onWorkflowStarted),
-		bus.Subscribe(b, o.onClaudeStreamOutput),
-		bus.Subscribe(b, o.onTransitionOccurred),
-	}
+	o := &DebugObserver{pending: make(map[string]*stepLog)}
+	o.progress = sync.NewCond(&o.mu)
+	o.cancel = bus.SubscribeAll(b,
+		bus.On(o.onWorkflowStarted),
+		bus.On(o.onClaudeStreamOutput),
+		bus.On(o.onStateCompleted),
+		bus.On(o.onAgentTerminated),
+		bus.On(o.onErrorOccurred),
+		bus.On(o.onTransitionOccurred),
+		bus.On(o.onWorkflowCompleted),
+		bus.On(o.onWorkflowPaused),
+		bus.On(o.onWorkflowEnded),
+	)
 	return o
 }
 
-// Close unregisters all subscriptions from the bus.
+// Close unregisters all subscriptions from the bus, writes any buffered
+// output and releases open file handles.
 func (o *DebugObserver) Close() {
-	for _, cancel := range o.cancels {
-		cancel()
+	if o.cancel != nil {
+		o.cancel()
+		o.cancel = nil
 	}
-	o.cancels = nil
+
+	o.mu.Lock()
+	o.releaseAll()
+	o.mu.Unlock()
+	o.waitQueued()
+}
+
+// Flush writes all buffered stream lines to their step files and waits for
+// every queued write to complete.
+func (o *DebugObserver) Flush() {
+	o.mu.Lock()
+	o.flushAll()
+	o.mu.Unlock()
+	o.waitQueued()
 }
 
 func (o *DebugObserver) onWorkflowStarted(e events.WorkflowStarted) {
@@ -58,32 +150,154 @@ func (o *DebugObserver) onWorkflowStarted(e events.WorkflowStarted) {
 		return
 	}
 	if err := os.MkdirAll(e.DebugDir, 0o700); err != nil {
-		fmt.Fprintf(os.Stderr, "debug observer: cannot create debug dir %s: %v\n", e.DebugDir, err)
+		warnf("cannot create debug dir %s: %v", e.DebugDir, err)
 		return
 	}
 	o.mu.Lock()
+	if o.debugDir != e.DebugDir {
+		// Cached step paths point into the old directory.
+		o.releaseAll()
+	}
 	o.debugDir = e.DebugDir
 	o.mu.Unlock()
 }
 
+func (o *DebugObserver) onWorkflowCompleted(events.WorkflowCompleted) {
+	o.mu.Lock()
+	o.releaseAll()
+	o.mu.Unlock()
+	o.waitQueued()
+}
+
+func (o *DebugObserver) onWorkflowPaused(events.WorkflowPaused) {
+	o.mu.Lock()
+	o.releaseAll()
+	o.mu.Unlock()
+	o.waitQueued()
+}
+
+func (o *DebugObserver) onWorkflowEnded(events.WorkflowEnded) {
+	o.mu.Lock()
+	o.releaseAll()
+	o.mu.Unlock()
+	o.waitQueued()
+}
+
 func (o *DebugObserver) onClaudeStreamOutput(e events.ClaudeStreamOutput) {
 	o.mu.Lock()
+	defer o.mu.Unlock()
 	dir := o.debugDir
-	o.mu.Unlock()
 	if dir == "" {
 		return
 	}
 
-	stem := stripExt(e.StateName)
-	filename := fmt.Sprintf("%s_%s_%03d.jsonl", e.AgentID, stem, e.StepNumber)
-	path := filepath.Join(dir, filename)
+	sl := o.pending[e.AgentID]
+	if sl == nil {
+		sl = newStepLog()
+		o.pending[e.AgentID] = sl
+	}
+	// An agent streams many objects per step, so the extension-stripped stem
+	// and the step file path are derived once per step rather than per object.
+	if sl.path == "" || sl.stateName != e.StateName || sl.step != e.StepNumber {
+		o.flushStep(sl)
+		if sl.stateName != e.StateName {
+			sl.stateName = e.StateName
+			sl.stem = parsing.ExtractStateName(e.StateName)
+		}
+		sl.step = e.StepNumber
+		filename := fmt.Sprintf("%s_%s_%03d.jsonl", e.AgentID, sl.stem, e.StepNumber)
+		sl.path = filepath.Join(dir, filename)
+	}
+	// Encode straight into the batch buffer; Encode appends the newline and
+	// writes nothing if marshalling fails.
+	if err := sl.enc.Encode(e.JSONObject); err != nil {
+		warnf("marshal error for %s step %d: %v", e.StateName, e.StepNumber, err)
+		return
+	}
+	if sl.lines == 0 {
+		o.armBatchTimer(sl)
+	}
+	sl.lines++
+	if sl.lines >= maxBatchLines {
+		o.flushStep(sl)
+	}
+}
+
+// armBatchTimer schedules a flush of the batch sl has just started, so that a
+// quiet agent's lines reach disk within maxBatchAge. Caller must hold o.mu.
+func (o *DebugObserver) armBatchTimer(sl *stepLog) {
+	var t *time.Timer
+	t = time.AfterFunc(maxBatchAge, func() {
+		o.mu.Lock()
+		defer o.mu.Unlock()
+		// A timer that fired while its batch was being flushed finds a
+		// different (or no) timer armed and leaves the next batch alone.
+		if sl.timer == t {
+			o.flushStep(sl)
+		}
+	})
+	sl.timer = t
+}
 
-	line, err := json.Marshal(e.JSONObject)
-	if err != nil {
-		fmt.Fprintf(os.Stderr, "debug observer: marshal error for %s step %d: %v\n", e.StateName, e.StepNumber, err)
+func (o *DebugObserver) onStateCompleted(e events.StateCompleted) {
+	o.mu.Lock()
+	if sl := o.pending[e.AgentID]; sl != nil {
+		o.flushStep(sl)
+	}
+	o.mu.Unlock()
+}
+
+// onAgentTerminated writes the agent's remaining lines and drops its stepLog;
+// a terminated agent never streams again.
+func (o *DebugObserver) onAgentTerminated(e events.AgentTerminated) {
+	o.mu.Lock()
+	if sl := o.pending[e.AgentID]; sl != nil {
+		o.flushStep(sl)
+		delete(o.pending, e.AgentID)
+	}
+	o.mu.Unlock()
+}
+
+func (o *DebugObserver) onErrorOccurred(e events.ErrorOccurred) {
+	o.mu.Lock()
+	if sl := o.pending[e.AgentID]; sl != nil {
+		o.flushStep(sl)
+	}
+	o.mu.Unlock()
+	// Errors are rare and may be followed by process exit; make sure the
+	// output leading up to them is on disk.
+	o.waitQueued()
+}
+
+// flushAll queues every agent's buffered stream lines. Caller must hold o.mu.
+func (o *DebugObserver) flushAll() {
+	for _, sl := range o.pending {
+		o.flushStep(sl)
+	}
+}
+
+// releaseAll queues every buffered line, drops all stepLogs at once and
+// queues the release of the transitions.log handle. Caller must hold o.mu.
+func (o *DebugObserver) releaseAll() {
+	o.flushAll()
+	o.pending = make(map[string]*stepLog)
+	o.enqueue(writeJob{closeLog: true})
+}
+
+// flushStep hands sl's buffered lines to the writer as a single append.
+// Caller must hold o.mu.
+func (o *DebugObserver) flushStep(sl *stepLog) {
+	if sl.lines == 0 {
 		return
 	}
-	appendToFile(path, string(line)+"\n")
+	if sl.timer != nil {
+		sl.timer.Stop()
+		sl.timer = nil
+	}
+	o.enqueue(writeJob{path: sl.path, data: sl.buf.Bytes()})
+	// The queued job owns the old backing array; start a fresh buffer.
+	sl.buf = bytes.Buffer{}
+	sl.lines = 0
 }
 
 func (o *DebugObserver) onTransitionOccurred(e events.TransitionOccurred) {
@@ -94,8 +308,7 @@ func (o *DebugObserver) onTransitionOccurred(e events.TransitionOccurred) {
 		return
 	}
 
-	logPath := filepath.Join(dir, "transitions.log")
-	var sb strings.Builder
+	var sb bytes.Buffer
 
 	ts := e.Timestamp.Format("2006-01-02T15:04:05.000000")
 	if e.ToState != "" {
@@ -106,38 +319,161 @@ func (o *DebugObserver) onTransitionOccurred(e events.TransitionOccurred) {
 			ts, e.AgentID, e.FromState)
 	}
 
-	// Write sorted metadata key-value pairs for deterministic output.
-	for _, k := range sortedKeys(e.Metadata) {
-		fmt.Fprintf(&sb, "  %s: %v\n", k, e.Metadata[k])
+	// Write sorted metadata key-value pairs for deterministic output. Most
+	// transitions carry none, so skip collecting and sorting keys entirely.
+	if len(e.Metadata) > 0 {
+		for _, k := range sortedKeys(e.Metadata) {
+			fmt.Fprintf(&sb, "  %s: %v\n", k, e.Metadata[k])
+		}
 	}
-	sb.WriteString("\n")
+	sb.WriteByte('\n')
 
-	appendToFile(logPath, sb.String())
+	o.mu.Lock()
+	o.enqueue(writeJob{
+		path:        filepath.Join(dir, "transitions.log"),
+		data:        sb.Bytes(),
+		transitions: true,
+	})
+	o.mu.Unlock()
+}
+
+// enqueue adds j to the write queue, starting the writer goroutine if none is
+// running. Caller must hold o.mu.
+func (o *DebugObserver) enqueue(j writeJob) {
+	o.queue = append(o.queue, j)
+	o.queued++
+	if !o.writing {
+		o.writing = true
+		go o.writeLoop()
+	}
+}
+
+// waitQueued blocks until every write queued before the call has completed.
+// Writes queued meanwhile, for example by agents that keep streaming, are
+// not waited for. Caller must not hold o.mu.
+func (o *DebugObserver) waitQueued() {
+	o.mu.Lock()
+	defer o.mu.Unlock()
+	for target := o.queued; o.written < target; {
+		o.progress.Wait()
+	}
 }
 
-// appendToFile appends text to path, creating the file if necessary.
+// writeLoop drains the queue in order and exits once it is empty.
+func (o *DebugObserver) writeLoop() {
+	for {
+		o.mu.Lock()
+		jobs := o.queue
+		o.queue = nil
+		if len(jobs) == 0 {
+			o.writing = false
+			o.mu.Unlock()
+			return
+		}
+		o.mu.Unlock()
+
+		// Progress is published per job, not per batch, so a waiter is not
+		// held up by a slow write queued after its own.
+		for _, j := range coalesce(jobs) {
+			o.runJob(j)
+			o.mu.Lock()
+			o.written += uint64(j.merged)
+			o.progress.Broadcast()
+			o.mu.Unlock()
+		}
+	}
+}
+
+// coalesce merges runs of consecutive jobs that append to the same file into
+// a single job, so a backlog of batches costs one write per file rather than
+// one per batch. Queue order is preserved.
+func coalesce(jobs []writeJob) []writeJob {
+	out := jobs[:0]
+	for i := 0; i < len(jobs); {
+		j := jobs[i]
+		k := i + 1
+		if !j.closeLog {
+			for k < len(jobs) && !jobs[k].closeLog &&
+				jobs[k].path == j.path && jobs[k].transitions == j.transitions {
+				k++
+			}
+		}
+		if k-i > 1 {
+			size := 0
+			for _, m := range jobs[i:k] {
+				size += len(m.data)
+			}
+			data := make([]byte, 0, size)
+			for _, m := range jobs[i:k] {
+				data = append(data, m.data...)
+			}
+			j.data = data
+		}
+		j.merged = k - i
+		out = append(out, j)
+		i = k
+	}
+	return out
+}
+
+// runJob performs a single queued write on the writer goroutine.
+func (o *DebugObserver) runJob(j writeJob) {
+	switch {
+	case j.closeLog:
+		o.closeTransitionsLog()
+	case j.transitions:
+		if o.transitionsLog != nil && o.transitionsLog.Name() != j.path {
+			o.closeTransitionsLog()
+		}
+		if o.transitionsLog == nil {
+			f, err := os.OpenFile(j.path, os.O_APPEND|os.O_CREATE|os.O_WRONLY, 0o600)
+			if err != nil {
+				warnf("cannot open %s: %v", j.path, err)
+				return
+			}
+			o.transitionsLog = f
+		}
+		if _, err := o.transitionsLog.Write(j.data); err != nil {
+			warnf("write error for %s: %v", j.path, err)
+		}
+	default:
+		appendStepFile(j.path, j.data)
+	}
+}
+
+// closeTransitionsLog closes the transitions.log handle if one is open.
+// Called only from the writer goroutine.
+func (o *DebugObserver) closeTransitionsLog() {
+	if o.transitionsLog == nil {
+		return
+	}
+	if err := o.transitionsLog.Close(); err != nil {
+		warnf("close error for %s: %v", o.transitionsLog.Name(), err)
+	}
+	o.transitionsLog = nil
+}
+
+// appendStepFile writes a step file batch; it is replaced in tests.
+var appendStepFile = appendToFile
+
+// appendToFile appends data to path, creating the file if necessary.
 // Errors are written to stderr so that debug output failures are visible.
-func appendToFile(path, text string) {
+func appendToFile(path string, data []byte) {
 	f, err := os.OpenFile(path, os.O_APPEND|os.O_CREATE|os.O_WRONLY, 0o600)
 	if err != nil {
-		fmt.Fprintf(os.Stderr, "debug observer: cannot open %s: %v\n", path, err)
+		warnf("cannot open %s: %v", path, err)
 		return
 	}
 	defer f.Close()
-	if _, err := f.WriteString(text); err != nil {
-		fmt.Fprintf(os.Stderr, "debug observer: write error for %s: %v\n", path, err)
+	if _, err := f.Write(data); err != nil {
+		warnf("write error for %s: %v", path, err)
 	}
 }
 
-// stripExt removes the last known workflow-state extension from name.
-func stripExt(name string) string {
-	lower := strings.ToLower(name)
-	for _, ext := range []string{".md", ".sh", ".bat", ".ps1"} {
-		if strings.HasSuffix(lower, ext) {
-			return name[:len(name)-len(ext)]
-		}
-	}
-	return name
+// warnf reports a debug-output failure on stderr. It is the observer's single
+// reporting site; the message is only formatted when a failure occurs.
+func warnf(format string, args ...any) {
+	fmt.Fprintf(os.Stderr, "debug observer: "+format+"\n", args...)
 }
 
 // sortedKeys returns the keys of m in ascending sorted order.
@@ -2,6 +2,7 @@ package debug_test
 
 import (
 	"encoding/json"
+	"fmt"
 	"os"
 	"path/filepath"
 	"strings"
@@ -18,7 +19,7 @@ import (
 
 // setupDebug creates a new Bus, DebugObserver, and a temp debug directory,
 // emitting WorkflowStarted to activate the observer.
-func setupDebug(t *testing.T) (*bus.Bus, string) {
+func setupDebug(t *testing.T) (*bus.Bus, *debug.DebugObserver, string) {
 	t.Helper()
 	b := bus.New()
 	obs := debug.New(b)
@@ -30,7 +31,7 @@ func setupDebug(t *testing.T) (*bus.Bus, string) {
 		DebugDir:   dir,
 		Timestamp:  time.Now(),
 	})
-	return b, dir
+	return b, obs, dir
 }
 
 // ----------------------------------------------------------------------------
@@ -38,7 +39,7 @@ func setupDebug(t *testing.T) (*bus.Bus, string) {
 // ----------------------------------------------------------------------------
 
 func TestDebugCreatesJSONLFile(t *testing.T) {
-	b, dir := setupDebug(t)
+	b, obs, dir := setupDebug(t)
 
 	b.Emit(events.ClaudeStreamOutput{
 		AgentID:    "main",
@@ -48,6 +49,7 @@ func TestDebugCreatesJSONLFile(t *testing.T) {
 		Timestamp:  time.Now(),
 	})
 
+	obs.Flush()
 	path := filepath.Join(dir, "main_START_001.jsonl")
 	data, err := os.ReadFile(path)
 	require.NoError(t, err)
@@ -61,7 +63,7 @@ func TestDebugCreatesJSONLFile(t *testing.T) {
 }
 
 func TestDebugAppendsMultipleLinesPerStep(t *testing.T) {
-	b, dir := setupDebug(t)
+	b, obs, dir := setupDebug(t)
 
 	b.Emit(events.ClaudeStreamOutput{
 		AgentID: "main", StateName: "START.md", StepNumber: 1,
@@ -72,6 +74,7 @@ func TestDebugAppendsMultipleLinesPerStep(t *testing.T) {
 		JSONObject: map[string]any{"seq": 2.0}, Timestamp: time.Now(),
 	})
 
+	obs.Flush()
 	path := filepath.Join(dir, "main_START_001.jsonl")
 	data, err := os.ReadFile(path)
 	require.NoError(t, err)
@@ -80,20 +83,21 @@ func TestDebugAppendsMultipleLinesPerStep(t *testing.T) {
 }
 
 func TestDebugStepNumberZeroPadded(t *testing.T) {
-	b, dir := setupDebug(t)
+	b, obs, dir := setupDebug(t)
 
 	b.Emit(events.ClaudeStreamOutput{
 		AgentID: "main", StateName: "REVIEW.md", StepNumber: 12,
 		JSONObject: map[string]any{}, Timestamp: time.Now(),
 	})
 
+	obs.Flush()
 	path := filepath.Join(dir, "main_REVIEW_012.jsonl")
 	_, err := os.ReadFile(path)
 	require.NoError(t, err, "file must exist with zero-padded step number")
 }
 
 func TestDebugSeparateStepFiles(t *testing.T) {
-	b, dir := setupDebug(t)
+	b, obs, dir := setupDebug(t)
 
 	b.Emit(events.ClaudeStreamOutput{
 		AgentID: "main", StateName: "A.md", StepNumber: 1,
@@ -104,6 +108,7 @@ func TestDebugSeparateStepFiles(t *testing.T) {
 		JSONObject: map[string]any{"step": "B"}, Timestamp: time.Now(),
 	})
 
+	obs.Flush()
 	_, err := os.ReadFile(filepath.Join(dir, "main_A_001.jsonl"))
 	require.NoError(t, err)
 	_, err = os.ReadFile(filepath.Join(dir, "main_B_002.jsonl"))
@@ -111,13 +116,14 @@ func TestDebugSeparateStepFiles(t *testing.T) {
 }
 
 func TestDebugWorkerAgentFiles(t *testing.T) {
-	b, dir := setupDebug(t)
+	b, obs, dir := setupDebug(t)
 
 	b.Emit(events.ClaudeStreamOutput{
 		AgentID: "main_worker1", StateName: "ANALYZE.md", StepNumber: 1,
 		JSONObject: map[string]any{"type": "result"}, Timestamp: time.Now(),
 	})
 
+	obs.Flush()
 	path := filepath.Join(dir, "main_worker1_ANALYZE_001.jsonl")
 	_, err := os.ReadFile(path)
 	require.NoError(t, err)
@@ -138,12 +144,198 @@ func TestDebugNoOpWhenDebugDirEmpty(t *testing.T) {
 	})
 }
 
+func TestDebugStreamLinesBufferedUntilStateCompleted(t *testing.T) {
+	b, obs, dir := setupDebug(t)
+	path := filepath.Join(dir, "main_START_001.jsonl")
+
+	b.Emit(events.ClaudeStreamOutput{
+		AgentID: "main", StateName: "START.md", StepNumber: 1,
+		JSONObject: map[string]any{"seq": 1.0}, Timestamp: time.Now(),
+	})
+	obs.WaitWrites()
+	_, err := os.Stat(path)
+	require.True(t, os.IsNotExist(err), "line should still be buffered")
+
+	b.Emit(events.StateCompleted{AgentID: "main", StateName: "START.md", Timestamp: time.Now()})
+	obs.WaitWrites()
+
+	data, err := os.ReadFile(path)
+	require.NoError(t, err)
+	assert.Equal(t, "{\"seq\":1}\n", string(data))
+}
+
+func TestDebugStreamBatchWrittenAtLineLimit(t *testing.T) {
+	b, obs, dir := setupDebug(t)
+
+	for i := 0; i < debug.MaxBatchLines; i++ {
+		b.Emit(events.ClaudeStreamOutput{
+			AgentID: "main", StateName: "START.md", StepNumber: 1,
+			JSONObject: map[string]any{"seq": i}, Timestamp: time.Now(),
+		})
+	}
+	obs.WaitWrites()
+
+	data, err := os.ReadFile(filepath.Join(dir, "main_START_001.jsonl"))
+	require.NoError(t, err)
+	lines := strings.Split(strings.TrimSpace(string(data)), "\n")
+	assert.Len(t, lines, debug.MaxBatchLines)
+}
+
+func TestDebugStreamBatchWrittenAfterMaxAge(t *testing.T) {
+	b, _, dir := setupDebug(t)
+	path := filepath.Join(dir, "main_START_001.jsonl")
+
+	// No further line, state completion or flush follows; only the age
+	// timer can write this one.
+	b.Emit(events.ClaudeStreamOutput{
+		AgentID: "main", StateName: "START.md", StepNumber: 1,
+		JSONObject: map[string]any{"seq": 1.0}, Timestamp: time.Now(),
+	})
+
+	require.Eventually(t, func() bool {
+		data, err := os.ReadFile(path)
+		return err == nil && string(data) == "{\"seq\":1}\n"
+	}, 40*debug.MaxBatchAge, debug.MaxBatchAge/5)
+}
+
+func TestDebugStreamLinesWrittenOnAgentTerminated(t *testing.T) {
+	b, obs, dir := setupDebug(t)
+
+	b.Emit(events.ClaudeStreamOutput{
+		AgentID: "main_worker1", StateName: "WORK.md", StepNumber: 3,
+		JSONObject: map[string]any{"type": "result"}, Timestamp: time.Now(),
+	})
+	b.Emit(events.AgentTerminated{AgentID: "main_worker1", Timestamp: time.Now()})
+
+	obs.WaitWrites()
+	_, err := os.ReadFile(filepath.Join(dir, "main_worker1_WORK_003.jsonl"))
+	require.NoError(t, err)
+}
+
+func TestDebugStreamLinesKeepTagsUnescaped(t *testing.T) {
+	b, obs, dir := setupDebug(t)
+
+	b.Emit(events.ClaudeStreamOutput{
+		AgentID: "main", StateName: "START.md", StepNumber: 1,
+		JSONObject: map[string]any{"text": "<goto>NEXT.md</goto> & done"}, Timestamp: time.Now(),
+	})
+
+	obs.Flush()
+	data, err := os.ReadFile(filepath.Join(dir, "main_START_001.jsonl"))
+	require.NoError(t, err)
+	assert.Equal(t, "{\"text\":\"<goto>NEXT.md</goto> & done\"}\n", string(data))
+}
+
+func TestDebugStreamBatchesKeepOrder(t *testing.T) {
+	b, obs, dir := setupDebug(t)
+
+	total := 3*debug.MaxBatchLines + 5
+	for i := 0; i < total; i++ {
+		b.Emit(events.ClaudeStreamOutput{
+			AgentID: "main", StateName: "START.md", StepNumber: 1,
+			JSONObject: map[string]any{"seq": i}, Timestamp: time.Now(),
+		})
+	}
+
+	obs.Flush()
+	data, err := os.ReadFile(filepath.Join(dir, "main_START_001.jsonl"))
+	require.NoError(t, err)
+	lines := strings.Split(strings.TrimSpace(string(data)), "\n")
+	require.Len(t, lines, total)
+	for i, line := range lines {
+		assert.Equal(t, fmt.Sprintf("{\"seq\":%d}", i), line)
+	}
+}
+
+func TestDebugStreamLinesFlushedOnError(t *testing.T) {
+	b, _, dir := setupDebug(t)
+
+	b.Emit(events.ClaudeStreamOutput{
+		AgentID: "main", StateName: "START.md", StepNumber: 1,
+		JSONObject: map[string]any{"type": "assistant"}, Timestamp: time.Now(),
+	})
+	b.Emit(events.ErrorOccurred{AgentID: "main", ErrorMessage: "boom", Timestamp: time.Now()})
+
+	_, err := os.ReadFile(filepath.Join(dir, "main_START_001.jsonl"))
+	require.NoError(t, err)
+}
+
+func TestDebugStreamLinesWrittenOnWorkflowEnded(t *testing.T) {
+	b, _, dir := setupDebug(t)
+
+	b.Emit(events.ClaudeStreamOutput{
+		AgentID: "main", StateName: "START.md", StepNumber: 1,
+		JSONObject: map[string]any{"seq": 1.0}, Timestamp: time.Now(),
+	})
+	// A run that ends on a fatal error emits WorkflowEnded alone, and nothing
+	// closes the observer; the line must be on disk once the event returns.
+	b.Emit(events.WorkflowEnded{WorkflowID: "wf1", Timestamp: time.Now()})
+
+	data, err := os.ReadFile(filepath.Join(dir, "main_START_001.jsonl"))
+	require.NoError(t, err)
+	assert.Equal(t, "{\"seq\":1}\n", string(data))
+}
+
+func TestDebugErrorWaitsOnlyForEarlierWrites(t *testing.T) {
+	// Writes to SLOW step files block until released, one per send.
+	release := make(chan struct{})
+	restore := debug.SetStepWriter(func(path string, data []byte) {
+		if strings.Contains(path, "_SLOW_") {
+			<-release
+		}
+		debug.AppendToFile(path, data)
+	})
+	b, obs, dir := setupDebug(t)
+	// Cleanups run last-registered first: unblock the writer, let Close
+	// drain it, then restore the writer.
+	t.Cleanup(restore)
+	t.Cleanup(obs.Close)
+	t.Cleanup(func() { close(release) })
+
+	stream := func(agentID, state string, step int) {
+		b.Emit(events.ClaudeStreamOutput{
+			AgentID: agentID, StateName: state, StepNumber: step,
+			JSONObject: map[string]any{"step": step}, Timestamp: time.Now(),
+		})
+		b.Emit(events.StateCompleted{AgentID: agentID, StateName: state, Timestamp: time.Now()})
+	}
+
+	// Hold the writer on a worker's step file.
+	stream("main_worker1", "SLOW.md", 1)
+	queued := obs.QueuedWrites()
+
+	done := make(chan struct{})
+	go func() {
+		b.Emit(events.ClaudeStreamOutput{
+			AgentID: "main", StateName: "START.md", StepNumber: 1,
+			JSONObject: map[string]any{"type": "error"}, Timestamp: time.Now(),
+		})
+		b.Emit(events.ErrorOccurred{AgentID: "main", ErrorMessage: "boom", Timestamp: time.Now()})
+		close(done)
+	}()
+	require.Eventually(t, func() bool { return obs.QueuedWrites() == queued+1 },
+		5*time.Second, time.Millisecond)
+
+	// The worker keeps streaming after the error; its next write blocks too.
+	stream("main_worker1", "SLOW.md", 2)
+	release <- struct{}{}
+
+	select {
+	case <-done:
+	case <-time.After(5 * time.Second):
+		t.Fatal("ErrorOccurred waited for a write queued after it")
+	}
+	data, err := os.ReadFile(filepath.Join(dir, "main_START_001.jsonl"))
+	require.NoError(t, err)
+	assert.Equal(t, "{\"type\":\"error\"}\n", string(data))
+}
+
 // ----------------------------------------------------------------------------
 // transitions.log
 // ----------------------------------------------------------------------------
 
 func TestDebugTransitionsLogGoto(t *testing.T) {
-	b, dir := setupDebug(t)
+	b, obs, dir := setupDebug(t)
 
 	b.Emit(events.TransitionOccurred{
 		AgentID:        "main",
@@ -154,6 +346,7 @@ func TestDebugTransitionsLogGoto(t *testing.T) {
 		Timestamp:      time.Date(2026, 1, 15, 14, 30, 22, 123456000, time.UTC),
 	})
 
+	obs.Flush()
 	data, err := os.ReadFile(filepath.Join(dir, "transitions.log"))
 	require.NoError(t, err)
 	content := string(data)
@@ -164,7 +357,7 @@ func TestDebugTransitionsLogGoto(t *testing.T) {
 }
 
 func TestDebugTransitionsLogTermination(t *testing.T) {
-	b, dir := setupDebug(t)
+	b, obs, dir := setupDebug(t)
 
 	b.Emit(events.TransitionOccurred{
 		AgentID:        "main",
@@ -175,6 +368,7 @@ func TestDebugTransitionsLogTermination(t *testing.T) {
 		Timestamp:      time.Now(),
 	})
 
+	obs.Flush()
 	data, err := os.ReadFile(filepath.Join(dir, "transitions.log"))
 	require.NoError(t, err)
 	content := string(data)
@@ -183,7 +377,7 @@ func TestDebugTransitionsLogTermination(t *testing.T) {
 }
 
 func TestDebugTransitionsLogMultiple(t *testing.T) {
-	b, dir := setupDebug(t)
+	b, obs, dir := setupDebug(t)
 
 	b.Emit(events.TransitionOccurred{
 		AgentID:        "main",
@@ -202,6 +396,7 @@ func TestDebugTransitionsLogMultiple(t *testing.T) {
 		Timestamp:      time.Now(),
 	})
 
+	obs.Flush()
 	data, err := os.ReadFile(filepath.Join(dir, "transitions.log"))
 	require.NoError(t, err)
 	content := string(data)
@@ -209,8 +404,25 @@ func TestDebugTransitionsLogMultiple(t *testing.T) {
 	assert.Contains(t, content, "B.md -> C.md")
 }
 
+func TestDebugTransitionsLogNoMetadata(t *testing.T) {
+	b, obs, dir := setupDebug(t)
+
+	b.Emit(events.TransitionOccurred{
+		AgentID:        "main",
+		FromState:      "A.md",
+		ToState:        "B.md",
+		TransitionType: "goto",
+		Timestamp:      time.Date(2026, 1, 15, 14, 30, 22, 0, time.UTC),
+	})
+
+	obs.Flush()
+	data, err := os.ReadFile(filepath.Join(dir, "transitions.log"))
+	require.NoError(t, err)
+	assert.Equal(t, "2026-01-15T14:30:22.000000 [main] A.md -> B.md (goto)\n\n", string(data))
+}
+
 func TestDebugTransitionsLogMetadataSorted(t *testing.T) {
-	b, dir := setupDebug(t)
+	b, obs, dir := setupDebug(t)
 
 	b.Emit(events.TransitionOccurred{
 		AgentID:        "main",
@@ -221,6 +433,7 @@ func TestDebugTransitionsLogMetadataSorted(t *testing.T) {
 		Timestamp:      time.Now(),
 	})
 
+	obs.Flush()
 	data, err := os.ReadFile(filepath.Join(dir, "transitions.log"))
 	require.NoError(t, err)
 	content := string(data)
@@ -232,6 +445,46 @@ func TestDebugTransitionsLogMetadataSorted(t *testing.T) {
 	assert.Greater(t, zzzIdx, mmmIdx, "zzz should follow mmm")
 }
 
+func TestDebugTransitionsLogReopensAfterWorkflowPaused(t *testing.T) {
+	b, obs, dir := setupDebug(t)
+
+	b.Emit(events.TransitionOccurred{
+		AgentID: "main", FromState: "A.md", ToState: "B.md",
+		TransitionType: "goto", Timestamp: time.Now(),
+	})
+	b.Emit(events.WorkflowPaused{WorkflowID: "wf1", Timestamp: time.Now()})
+	b.Emit(events.TransitionOccurred{
+		AgentID: "main", FromState: "B.md", ToState: "C.md",
+		TransitionType: "goto", Timestamp: time.Now(),
+	})
+
+	obs.Flush()
+	data, err := os.ReadFile(filepath.Join(dir, "transitions.log"))
+	require.NoError(t, err)
+	content := string(data)
+	assert.Contains(t, content, "A.md -> B.md")
+	assert.Contains(t, content, "B.md -> C.md")
+}
+
+func TestDebugTransitionsLogReleasedOnWorkflowEnded(t *testing.T) {
+	b, obs, dir := setupDebug(t)
+
+	b.Emit(events.TransitionOccurred{
+		AgentID: "main", FromState: "A.md", ToState: "B.md",
+		TransitionType: "goto", Timestamp: time.Now(),
+	})
+	require.True(t, obs.TransitionsLogOpen())
+
+	// Failed and cancelled runs end with WorkflowEnded alone; the daemon
+	// never closes the observer, so the handle must not outlive the run.
+	b.Emit(events.WorkflowEnded{WorkflowID: "wf1", Timestamp: time.Now()})
+	assert.False(t, obs.TransitionsLogOpen())
+
+	data, err := os.ReadFile(filepath.Join(dir, "transitions.log"))
+	require.NoError(t, err)
+	assert.Contains(t, string(data), "A.md -> B.md")
+}
+
 func TestDebugCloseUnsubscribes(t *testing.T) {
 	b := bus.New()
 	obs := debug.New(b)
@@ -0,0 +1,39 @@
+package debug
+
+// This file is compiled only during testing. It exposes the batch bounds so
+// the external test package can exercise the flush thresholds.
+
+// MaxBatchLines is the number of buffered stream lines that triggers a write.
+const MaxBatchLines = maxBatchLines
+
+// MaxBatchAge is how long a stream line may stay buffered before it is written.
+const MaxBatchAge = maxBatchAge
+
+// WaitWrites blocks until every queued write has completed, without queueing
+// stream lines that are still buffered.
+func (o *DebugObserver) WaitWrites() { o.waitQueued() }
+
+// TransitionsLogOpen waits for every queued write and reports whether the
+// writer still holds transitions.log open.
+func (o *DebugObserver) TransitionsLogOpen() bool {
+	o.waitQueued()
+	return o.transitionsLog != nil
+}
+
+// QueuedWrites reports how many writes have been queued so far.
+func (o *DebugObserver) QueuedWrites() uint64 {
+	o.mu.Lock()
+	defer o.mu.Unlock()
+	return o.queued
+}
+
+// AppendToFile is the default step file writer.
+var AppendToFile = appendToFile
+
+// SetStepWriter replaces the function that writes step file batches and
+// returns a func that restores it.
+func SetStepWriter(f func(path string, data []byte)) func() {
+	orig := appendStepFile
+	appendStepFile = f
+	return func() { appendStepFile = orig }
+}
@@ -14,11 +14,8 @@
 package titlebar
 
 import (
-	"fmt"
 	"io"
 	"os"
-	"path/filepath"
-	"strings"
 
 	"github.com/vector76/raymond/internal/bus"
 	"github.com/vector76/raymond/internal/events"
@@ -30,6 +27,7 @@ type TitleBarObserver struct {
 	w      io.Writer
 	cancel func()
 	name   string
+	prefix []byte // "ESC ] 2 ; [name ]ray: ", built once at construction
 }
 
 // New creates a TitleBarObserver subscribed to b that writes to os.Stdout.
@@ -41,6 +39,11 @@ func New(b *bus.Bus, name string) *TitleBarObserver {
 // to capture output without writing to the real terminal.
 func NewWithWriter(b *bus.Bus, w io.Writer, name string) *TitleBarObserver {
 	o := &TitleBarObserver{w: w, name: name}
+	if name != "" {
+		o.prefix = []byte("\x1b]2;" + name + " ray: ")
+	} else {
+		o.prefix = []byte("\x1b]2;ray: ")
+	}
 	o.cancel = bus.Subscribe(b, o.onStateStarted)
 	return o
 }
@@ -54,11 +57,12 @@ func (o *TitleBarObserver) Close() {
 }
 
 func (o *TitleBarObserver) onStateStarted(e events.StateStarted) {
-	if o.name != "" {
-		fmt.Fprintf(o.w, "\x1b]2;%s ray: %s\x07", o.name, stateStem(e.StateName))
-	} else {
-		fmt.Fprintf(o.w, "\x1b]2;ray: %s\x07", stateStem(e.StateName))
-	}
+	stem := stateStem(e.StateName)
+	buf := make([]byte, 0, len(o.prefix)+len(stem)+1)
+	buf = append(buf, o.prefix...)
+	buf = append(buf, stem...)
+	buf = append(buf, '\a')
+	_, _ = o.w.Write(buf)
 }
 
 // stateStem strips the last extension from a filename.
@@ -66,10 +70,14 @@ func (o *TitleBarObserver) onStateStarted(e events.StateStarted) {
 //	"START.md"    → "START"
 //	"foo.bar.md"  → "foo.bar"
 //	"NOOP"        → "NOOP"
+//
+// Equivalent to strings.TrimSuffix(name, filepath.Ext(name)) but done in a
+// single backward scan, since it runs on every StateStarted event.
 func stateStem(name string) string {
-	ext := filepath.Ext(name)
-	if ext == "" {
-		return name
+	for i := len(name) - 1; i >= 0 && !os.IsPathSeparator(name[i]); i-- {
+		if name[i] == '.' {
+			return name[:i]
+		}
 	}
-	return strings.TrimSuffix(name, ext)
+	return name
 }
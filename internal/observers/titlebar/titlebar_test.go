@@ -66,6 +66,17 @@ func TestTitleBarNoExtension(t *testing.T) {
 	assert.Equal(t, "\x1b]2;ray: NOOP\x07", buf.String())
 }
 
+func TestTitleBarIgnoresDotInDirectory(t *testing.T) {
+	b := bus.New()
+	var buf bytes.Buffer
+	obs := titlebar.NewWithWriter(b, &buf, "")
+	defer obs.Close()
+
+	b.Emit(events.StateStarted{AgentID: "main", StateName: "flows.v2/NOOP"})
+
+	assert.Equal(t, "\x1b]2;ray: flows.v2/NOOP\x07", buf.String())
+}
+
 func TestTitleBarMultipleStateTransitions(t *testing.T) {
 	b := bus.New()
 	var buf bytes.Buffer
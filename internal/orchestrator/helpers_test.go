@@ -7,6 +7,7 @@ import (
 
 	"github.com/stretchr/testify/assert"
 
+	"github.com/vector76/raymond/internal/events"
 	"github.com/vector76/raymond/internal/executors"
 	wfstate "github.com/vector76/raymond/internal/state"
 )
@@ -178,3 +179,51 @@ func TestAgentPausedReason_ClaudeError(t *testing.T) {
 func TestAgentPausedReason_GenericErrorFallsBackToClaudeError(t *testing.T) {
 	assert.Equal(t, "claude_error", agentPausedReason(errors.New("unknown")))
 }
+
+// ---------------------------------------------------------------------------
+// stateType
+// ---------------------------------------------------------------------------
+
+func TestStateType_ScriptExtensionsCaseInsensitive(t *testing.T) {
+	for _, name := range []string{"RUN.sh", "build.BAT", "Deploy.Sh"} {
+		assert.Equal(t, events.StateTypeScript, stateType(name), name)
+	}
+}
+
+func TestStateType_EverythingElseIsMarkdown(t *testing.T) {
+	for _, name := range []string{"START.md", "run.ps1", "NOEXT", "dir.sh/STATE.md"} {
+		assert.Equal(t, events.StateTypeMarkdown, stateType(name), name)
+	}
+}
+
+// ---------------------------------------------------------------------------
+// classifyError
+// ---------------------------------------------------------------------------
+
+func TestClassifyError_Policies(t *testing.T) {
+	cases := []struct {
+		err       error
+		typeName  string
+		retryable bool
+		reason    string
+	}{
+		{&executors.ClaudeCodeLimitError{Msg: "limit"}, "ClaudeCodeLimitError", false, events.PauseReasonUsageLimit},
+		{&executors.ClaudeCodeTimeoutWrappedError{Msg: "t"}, "ClaudeCodeTimeoutWrappedError", true, events.PauseReasonTimeout},
+		{&executors.PromptFileError{Msg: "p"}, "PromptFileError", true, events.PauseReasonPromptError},
+		{fmt.Errorf("wrapped: %w", &executors.ClaudeCodeError{Msg: "c"}), "ClaudeCodeError", true, events.PauseReasonClaudeError},
+	}
+	for _, c := range cases {
+		p, ok := classifyError(c.err)
+		assert.True(t, ok, c.typeName)
+		assert.Equal(t, c.typeName, p.typeName)
+		assert.Equal(t, c.retryable, p.retryable, c.typeName)
+		assert.Equal(t, c.reason, p.pauseReason, c.typeName)
+	}
+}
+
+func TestClassifyError_FatalErrorsUnmatched(t *testing.T) {
+	_, ok := classifyError(&executors.ScriptError{Msg: "script"})
+	assert.False(t, ok)
+	_, ok = classifyError(errors.New("unknown"))
+	assert.False(t, ok)
+}
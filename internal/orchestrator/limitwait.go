@@ -3,6 +3,7 @@ package orchestrator
 import (
 	"regexp"
 	"strings"
+	"sync"
 	"time"
 )
 
@@ -23,7 +24,7 @@ func parseResetWaitSeconds(msg string, now time.Time, bufferMinutes int) (float6
 	timeStr := strings.ToLower(m[1]) // e.g. "3pm", "12am"
 	tzName := m[2]                   // e.g. "America/Chicago"
 
-	loc, err := time.LoadLocation(tzName)
+	loc, err := loadLocation(tzName)
 	if err != nil {
 		return 0, false
 	}
@@ -71,6 +72,28 @@ func parseResetWaitSeconds(msg string, now time.Time, bufferMinutes int) (float6
 	return secs, true
 }
 
+// locations caches time.LoadLocation results by zone name. LoadLocation
+// reads the zoneinfo database on every call, and agents paused by the same
+// usage limit all name the same zone.
+var locations sync.Map // string -> locationEntry
+
+type locationEntry struct {
+	loc *time.Location
+	err error
+}
+
+// loadLocation is time.LoadLocation with results (including unknown-zone
+// errors) cached in locations.
+func loadLocation(name string) (*time.Location, error) {
+	if v, ok := locations.Load(name); ok {
+		e := v.(locationEntry)
+		return e.loc, e.err
+	}
+	loc, err := time.LoadLocation(name)
+	locations.Store(name, locationEntry{loc: loc, err: err})
+	return loc, err
+}
+
 // parseHourStr converts a numeric string to int, returning an error for
 // non-numeric input.
 func parseHourStr(s string) (int, error) {
@@ -116,6 +116,19 @@ func TestParseResetWaitSeconds_EmptyMessage(t *testing.T) {
 	assert.False(t, ok)
 }
 
+func TestLoadLocation_CachesResult(t *testing.T) {
+	first, err := loadLocation("America/Chicago")
+	assert.NoError(t, err)
+	second, err := loadLocation("America/Chicago")
+	assert.NoError(t, err)
+	assert.True(t, first == second, "second lookup should return the cached *time.Location")
+
+	_, err = loadLocation("Not/AReal/Zone")
+	assert.Error(t, err)
+	_, err = loadLocation("Not/AReal/Zone")
+	assert.Error(t, err, "cached unknown-zone lookups still fail")
+}
+
 // ---------------------------------------------------------------------------
 // computeAutoWait
 // ---------------------------------------------------------------------------
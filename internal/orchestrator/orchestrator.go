@@ -20,6 +20,7 @@
 package orchestrator
 
 import (
+	"bytes"
 	"context"
 	"errors"
 	"fmt"
@@ -352,6 +353,26 @@ func RunAllAgents(ctx context.Context, workflowID string, opts RunOptions) error
 		resetPausedAgents(ws)
 	}
 
+	// persist writes ws for crash recovery. The state is rewritten after every
+	// step and again at each pause/wait point, often with nothing changed in
+	// between, so the file write is skipped when the encoding matches the last
+	// one written. Only this loop writes the state file during a run.
+	var persisted []byte
+	persist := func() error {
+		data, err := wfstate.MarshalState(ws)
+		if err != nil {
+			return fmt.Errorf("failed to write state: %w", err)
+		}
+		if bytes.Equal(data, persisted) {
+			return nil
+		}
+		if err := wfstate.WriteStateData(workflowID, data, stateDir); err != nil {
+			return err
+		}
+		persisted = data
+		return nil
+	}
+
 	// Resolve the outer workflow backend up front. Per-state resolution
 	// happens via backendResolver in the launch closure, so that an agent
 	// that enters a nested cross-workflow with a different backend
@@ -481,6 +502,11 @@ func RunAllAgents(ctx context.Context, workflowID string, opts RunOptions) error
 		DebugDir:   debugDir,
 		Timestamp:  time.Now(),
 	})
+	// Every return from here on ends the run, including fatal step errors and
+	// cancellation; observers that buffer output flush it on WorkflowEnded.
+	defer func() {
+		b.Emit(events.WorkflowEnded{WorkflowID: workflowID, Timestamp: time.Now()})
+	}()
 
 	// Cancel context on exit so any still-running goroutines are signalled to stop.
 	ctx, cancel := context.WithCancel(ctx)
@@ -540,7 +566,7 @@ func RunAllAgents(ctx context.Context, workflowID string, opts RunOptions) error
 		if nextAgent, remaining := firstAskingAndCount(ws.Agents); nextAgent != nil {
 			// More asking agents remain. Persist the delivery and return
 			// the next agent's prompt — no agents proceed yet.
-			if err := wfstate.WriteState(workflowID, ws, stateDir); err != nil {
+			if err := persist(); err != nil {
 				return fmt.Errorf("write state: %w", err)
 			}
 			return &PendingAskError{
@@ -559,7 +585,7 @@ func RunAllAgents(ctx context.Context, workflowID string, opts RunOptions) error
 
 		// No more asking agents — persist the delivery and let all agents
 		// proceed together in the normal main loop below.
-		if err := wfstate.WriteState(workflowID, ws, stateDir); err != nil {
+		if err := persist(); err != nil {
 			return fmt.Errorf("write state: %w", err)
 		}
 	} else if !hasAskingAgents(ws.Agents) && opts.AskInput != "" {
@@ -657,10 +683,16 @@ func RunAllAgents(ctx context.Context, workflowID string, opts RunOptions) error
 
 		go func() {
 			execResult, execErr := exec.Execute(ctx, &agentCopy, localWS, &launchCtx)
-			resultCh <- stepResult{
+			// Once RunAllAgents has returned (ctx is cancelled on exit) nobody
+			// reads resultCh; drop the result rather than block forever when
+			// more executors are still finishing than the buffer holds.
+			select {
+			case resultCh <- stepResult{
 				agentID:    agentCopy.ID,
 				execResult: execResult,
 				err:        execErr,
+			}:
+			case <-ctx.Done():
 			}
 		}()
 	}
@@ -684,6 +716,185 @@ func RunAllAgents(ctx context.Context, workflowID string, opts RunOptions) error
 		return nil
 	}
 
+	// handleResult applies one executor result to ws: error handling or the
+	// transition, emitted events, and ask handling. Launching successors and
+	// persisting are left to the caller.
+	handleResult := func(result stepResult) error {
+		delete(running, result.agentID)
+
+		agentIdx := findAgentByID(ws.Agents, result.agentID)
+		if agentIdx < 0 {
+			// Agent was already removed (shouldn't happen).
+			return nil
+		}
+
+		agentBefore := ws.Agents[agentIdx]
+
+		if result.err != nil {
+			if fatalErr := handleStepError(result.err, agentIdx, ws, execCtx, b); fatalErr != nil {
+				return fatalErr
+			}
+			// handleStepError updated ws.Agents[agentIdx] in place.
+			// launchActive below will relaunch the agent if still active.
+		} else {
+			// Apply execResult.SessionID to agent BEFORE transition (handlers
+			// rely on the post-execution session ID; e.g. function pushes it
+			// onto the stack, reset/result then overwrite it).
+			if result.execResult.SessionID != nil {
+				ws.Agents[agentIdx].SessionID = result.execResult.SessionID
+			}
+
+			// Clear ContinueAndFork: the executor consumed it in its copy;
+			// we must clear it in persistent state so it does not fire again
+			// on resume.
+			ws.Agents[agentIdx].ContinueAndFork = false
+
+			// Accumulate cost into the shared total.
+			ws.TotalCostUSD += result.execResult.CostUSD
+
+			// Apply the transition.
+			var tr transitions.TransitionResult
+			var transErr error
+
+			if isMultiForkTransitions(result.execResult.Transitions) {
+				tr, transErr = applyMultiFork(&ws.Agents[agentIdx], result.execResult.Transitions, ws, b, agentBefore.CurrentState, fetch)
+			} else {
+				tr, transErr = transitions.ApplyTransition(&ws.Agents[agentIdx], result.execResult.Transition, ws, fetch)
+				if transErr == nil {
+					emitTransitionEvents(tr, agentBefore, result.execResult, ws, b)
+				}
+			}
+			if transErr != nil {
+				return transErr
+			}
+
+			// Apply transition result: update/remove agent in ws.Agents,
+			// append worker if present.
+			applyResult(tr, agentIdx, agentBefore.CurrentState, ws, b)
+
+			// Ask handling: detect when an agent enters asking
+			// status and apply the mode-specific strategy. applyResult
+			// updates a surviving agent in place (workers are only ever
+			// appended), so it is still at agentIdx; no rescan needed.
+			// Nothing below grows ws.Agents, so one pointer serves the
+			// whole block.
+			if tr.Agent != nil && ws.Agents[agentIdx].Status == wfstate.AgentStatusAsking {
+				a := &ws.Agents[agentIdx]
+
+				// Stamp the ask-entry timestamp for every ask
+				// (text-only or file-bearing) so the eventual
+				// resolved-input record carries a true entry time.
+				a.AskEnteredAt = time.Now()
+
+				// Stage display files (and create the per-input
+				// directory so uploads have a place to land) before
+				// notifying anyone the ask has started, so the
+				// notification carries the staged-file metadata.
+				stageFailed := false
+				var stageErr error
+				if affordance := a.AskFileAffordance; affordance != nil {
+					records, err := StageInputFiles(
+						a.TaskFolder,
+						a.AskID,
+						*affordance,
+					)
+					if err != nil {
+						stageFailed = true
+						stageErr = err
+					} else {
+						a.AskStagedFiles = records
+					}
+				}
+
+				if stageFailed {
+					// Do not enter the ask: clear the ask fields
+					// and pause the agent with a descriptive error
+					// (mirrors the on-ask=reject branch below).
+					a.Status = wfstate.AgentStatusPaused
+					a.Error = fmt.Sprintf(
+						"failed to stage files for <ask> in agent %q: %v",
+						agentBefore.ID, stageErr,
+					)
+					a.AskPrompt = ""
+					a.AskNextState = ""
+					a.AskTimeout = ""
+					a.AskTimeoutNext = ""
+					a.AskID = ""
+					a.AskFileAffordance = nil
+					a.AskStagedFiles = nil
+					a.AskEnteredAt = time.Time{}
+					b.Emit(events.AgentPaused{
+						AgentID:   agentBefore.ID,
+						Reason:    "ask_stage_error",
+						Error:     a.Error,
+						Timestamp: time.Now(),
+					})
+				} else if opts.DaemonMode {
+					// Daemon mode: siblings keep running. Notify
+					// the daemon layer via callback; the agent
+					// stays asking until input arrives on
+					// AskInputCh.
+					b.Emit(events.AgentAskStarted{
+						AgentID:   a.ID,
+						AskID:     a.AskID,
+						Prompt:    a.AskPrompt,
+						NextState: a.AskNextState,
+						Timeout:   a.AskTimeout,
+						Timestamp: time.Now(),
+					})
+					if opts.AskCallback != nil {
+						opts.AskCallback(
+							a.ID,
+							a.AskID,
+							a.AskPrompt,
+							a.AskNextState,
+							a.AskFileAffordance,
+							a.AskStagedFiles,
+						)
+					}
+				} else if opts.OnAsk == "pause" {
+					// CLI pause mode: quiesce all agents. The
+					// first agent to ask is the active ask;
+					// subsequent ones are queued.
+					if activeAsk == "" {
+						activeAsk = a.ID
+					} else {
+						preAskQueue = append(preAskQueue, a.ID)
+					}
+					pausing = true
+					b.Emit(events.AgentAskStarted{
+						AgentID:   a.ID,
+						AskID:     a.AskID,
+						Prompt:    a.AskPrompt,
+						NextState: a.AskNextState,
+						Timeout:   a.AskTimeout,
+						Timestamp: time.Now(),
+					})
+				} else {
+					// Runtime reject: fail the agent immediately.
+					a.Status = wfstate.AgentStatusPaused
+					a.Error = fmt.Sprintf(
+						"agent %q produced <ask> but --on-ask=reject is in effect; "+
+							"use --on-ask=pause or `ray serve`",
+						agentBefore.ID,
+					)
+					a.AskPrompt = ""
+					a.AskNextState = ""
+					a.AskTimeout = ""
+					a.AskTimeoutNext = ""
+					a.AskID = ""
+					b.Emit(events.AgentPaused{
+						AgentID:   agentBefore.ID,
+						Reason:    "ask_rejected",
+						Error:     a.Error,
+						Timestamp: time.Now(),
+					})
+				}
+			}
+		}
+		return nil
+	}
+
 	// Start: launch goroutines for all initial active agents.
 	if err := launchActive(); err != nil {
 		return err
@@ -731,7 +942,7 @@ func RunAllAgents(ctx context.Context, workflowID string, opts RunOptions) error
 					PausedAgentCount: len(ws.Agents),
 					Timestamp:        time.Now(),
 				})
-				if err := wfstate.WriteState(workflowID, ws, stateDir); err != nil {
+				if err := persist(); err != nil {
 					return err
 				}
 
@@ -792,7 +1003,7 @@ func RunAllAgents(ctx context.Context, workflowID string, opts RunOptions) error
 							WaitSeconds:      waitSec,
 							Timestamp:        now,
 						})
-						if err := wfstate.WriteState(workflowID, ws, stateDir); err != nil {
+						if err := persist(); err != nil {
 							return err
 						}
 						if waitSec > 0 {
@@ -817,7 +1028,7 @@ func RunAllAgents(ctx context.Context, workflowID string, opts RunOptions) error
 					PausedAgentCount: len(ws.Agents),
 					Timestamp:        time.Now(),
 				})
-				return wfstate.WriteState(workflowID, ws, stateDir)
+				return persist()
 			} else {
 				// Active agents with no goroutines: should not be reachable since
 				// launchActive() is called before every check. Return an error
@@ -882,179 +1093,22 @@ func RunAllAgents(ctx context.Context, workflowID string, opts RunOptions) error
 			if err := launchActive(); err != nil {
 				return err
 			}
-			if err := wfstate.WriteState(workflowID, ws, stateDir); err != nil {
+			if err := persist(); err != nil {
 				return fmt.Errorf("write state: %w", err)
 			}
 
 		case result := <-resultCh:
-			delete(running, result.agentID)
-
-			agentIdx := findAgentByID(ws.Agents, result.agentID)
-			if agentIdx < 0 {
-				// Agent was already removed (shouldn't happen).
-				if err := launchActive(); err != nil {
-					return err
-				}
-				continue
+			if err := handleResult(result); err != nil {
+				return err
 			}
 
-			agentBefore := ws.Agents[agentIdx]
-
-			if result.err != nil {
-				if fatalErr := handleStepError(result.err, agentIdx, ws, execCtx, b); fatalErr != nil {
-					return fatalErr
-				}
-				// handleStepError updated ws.Agents[agentIdx] in place.
-				// launchActive below will relaunch the agent if still active.
-			} else {
-				// Apply execResult.SessionID to agent BEFORE transition (handlers
-				// rely on the post-execution session ID; e.g. function pushes it
-				// onto the stack, reset/result then overwrite it).
-				if result.execResult.SessionID != nil {
-					ws.Agents[agentIdx].SessionID = result.execResult.SessionID
-				}
-
-				// Clear ContinueAndFork: the executor consumed it in its copy;
-				// we must clear it in persistent state so it does not fire again
-				// on resume.
-				ws.Agents[agentIdx].ContinueAndFork = false
-
-				// Accumulate cost into the shared total.
-				ws.TotalCostUSD += result.execResult.CostUSD
-
-				// Apply the transition.
-				var tr transitions.TransitionResult
-				var transErr error
-
-				if isMultiForkTransitions(result.execResult.Transitions) {
-					tr, transErr = applyMultiFork(&ws.Agents[agentIdx], result.execResult.Transitions, ws, b, agentBefore.CurrentState, fetch)
-				} else {
-					tr, transErr = transitions.ApplyTransition(&ws.Agents[agentIdx], result.execResult.Transition, ws, fetch)
-					if transErr == nil {
-						emitTransitionEvents(tr, agentBefore, result.execResult, ws, b)
-					}
-				}
-				if transErr != nil {
-					return transErr
-				}
-
-				// Apply transition result: update/remove agent in ws.Agents,
-				// append worker if present.
-				applyResult(tr, agentIdx, agentBefore.CurrentState, ws, b)
-
-				// Ask handling: detect when an agent enters asking
-				// status and apply the mode-specific strategy.
-				if idx := findAgentByID(ws.Agents, agentBefore.ID); idx >= 0 && ws.Agents[idx].Status == wfstate.AgentStatusAsking {
-					// Stamp the ask-entry timestamp for every ask
-					// (text-only or file-bearing) so the eventual
-					// resolved-input record carries a true entry time.
-					ws.Agents[idx].AskEnteredAt = time.Now()
-
-					// Stage display files (and create the per-input
-					// directory so uploads have a place to land) before
-					// notifying anyone the ask has started, so the
-					// notification carries the staged-file metadata.
-					stageFailed := false
-					var stageErr error
-					if affordance := ws.Agents[idx].AskFileAffordance; affordance != nil {
-						records, err := StageInputFiles(
-							ws.Agents[idx].TaskFolder,
-							ws.Agents[idx].AskID,
-							*affordance,
-						)
-						if err != nil {
-							stageFailed = true
-							stageErr = err
-						} else {
-							ws.Agents[idx].AskStagedFiles = records
-						}
-					}
-
-					if stageFailed {
-						// Do not enter the ask: clear the ask fields
-						// and pause the agent with a descriptive error
-						// (mirrors the on-ask=reject branch below).
-						a := &ws.Agents[idx]
-						a.Status = wfstate.AgentStatusPaused
-						a.Error = fmt.Sprintf(
-							"failed to stage files for <ask> in agent %q: %v",
-							agentBefore.ID, stageErr,
-						)
-						a.AskPrompt = ""
-						a.AskNextState = ""
-						a.AskTimeout = ""
-						a.AskTimeoutNext = ""
-						a.AskID = ""
-						a.AskFileAffordance = nil
-						a.AskStagedFiles = nil
-						a.AskEnteredAt = time.Time{}
-						b.Emit(events.AgentPaused{
-							AgentID:   agentBefore.ID,
-							Reason:    "ask_stage_error",
-							Error:     a.Error,
-							Timestamp: time.Now(),
-						})
-					} else if opts.DaemonMode {
-						// Daemon mode: siblings keep running. Notify
-						// the daemon layer via callback; the agent
-						// stays asking until input arrives on
-						// AskInputCh.
-						b.Emit(events.AgentAskStarted{
-							AgentID:   ws.Agents[idx].ID,
-							AskID:     ws.Agents[idx].AskID,
-							Prompt:    ws.Agents[idx].AskPrompt,
-							NextState: ws.Agents[idx].AskNextState,
-							Timeout:   ws.Agents[idx].AskTimeout,
-							Timestamp: time.Now(),
-						})
-						if opts.AskCallback != nil {
-							opts.AskCallback(
-								ws.Agents[idx].ID,
-								ws.Agents[idx].AskID,
-								ws.Agents[idx].AskPrompt,
-								ws.Agents[idx].AskNextState,
-								ws.Agents[idx].AskFileAffordance,
-								ws.Agents[idx].AskStagedFiles,
-							)
-						}
-					} else if opts.OnAsk == "pause" {
-						// CLI pause mode: quiesce all agents. The
-						// first agent to ask is the active ask;
-						// subsequent ones are queued.
-						if activeAsk == "" {
-							activeAsk = ws.Agents[idx].ID
-						} else {
-							preAskQueue = append(preAskQueue, ws.Agents[idx].ID)
-						}
-						pausing = true
-						b.Emit(events.AgentAskStarted{
-							AgentID:   ws.Agents[idx].ID,
-							AskID:     ws.Agents[idx].AskID,
-							Prompt:    ws.Agents[idx].AskPrompt,
-							NextState: ws.Agents[idx].AskNextState,
-							Timeout:   ws.Agents[idx].AskTimeout,
-							Timestamp: time.Now(),
-						})
-					} else {
-						// Runtime reject: fail the agent immediately.
-						ws.Agents[idx].Status = wfstate.AgentStatusPaused
-						ws.Agents[idx].Error = fmt.Sprintf(
-							"agent %q produced <ask> but --on-ask=reject is in effect; "+
-								"use --on-ask=pause or `ray serve`",
-							agentBefore.ID,
-						)
-						ws.Agents[idx].AskPrompt = ""
-						ws.Agents[idx].AskNextState = ""
-						ws.Agents[idx].AskTimeout = ""
-						ws.Agents[idx].AskTimeoutNext = ""
-						ws.Agents[idx].AskID = ""
-						b.Emit(events.AgentPaused{
-							AgentID:   agentBefore.ID,
-							Reason:    "ask_rejected",
-							Error:     ws.Agents[idx].Error,
-							Timestamp: time.Now(),
-						})
-					}
+			// Drain results that have already arrived before relaunching and
+			// persisting, so workers finishing together (fork/join) share one
+			// launchActive pass and one state write. Only this goroutine
+			// receives from resultCh, so a non-zero length never blocks.
+			for len(resultCh) > 0 {
+				if err := handleResult(<-resultCh); err != nil {
+					return err
 				}
 			}
 
@@ -1065,7 +1119,7 @@ func RunAllAgents(ctx context.Context, workflowID string, opts RunOptions) error
 			}
 
 			// Write state for crash recovery.
-			if err := wfstate.WriteState(workflowID, ws, stateDir); err != nil {
+			if err := persist(); err != nil {
 				return fmt.Errorf("write state: %w", err)
 			}
 		}
@@ -1179,25 +1233,32 @@ func emitTransitionEvents(
 	ws *wfstate.WorkflowState,
 	b *bus.Bus,
 ) {
-	toState := ""
-	if tr.Agent != nil {
-		toState = tr.Agent.CurrentState
-	}
-	meta := map[string]any{"state_type": stateType(agentBefore.CurrentState)}
-	if execResult.Transition.Tag == "result" {
-		meta["result_payload"] = execResult.Transition.Payload
+	// All events describe the same state change and share one timestamp.
+	now := time.Now()
+
+	// The metadata map is built for every transition; skip it when nothing
+	// (e.g. a quiet run without debug output) listens for transitions.
+	if bus.HasHandlers[events.TransitionOccurred](b) {
+		toState := ""
+		if tr.Agent != nil {
+			toState = tr.Agent.CurrentState
+		}
+		meta := map[string]any{"state_type": stateType(agentBefore.CurrentState)}
+		if execResult.Transition.Tag == "result" {
+			meta["result_payload"] = execResult.Transition.Payload
+		}
+		if tr.Worker != nil {
+			meta["spawned_agent_id"] = tr.Worker.ID
+		}
+		b.Emit(events.TransitionOccurred{
+			AgentID:        agentBefore.ID,
+			FromState:      agentBefore.CurrentState,
+			ToState:        toState,
+			TransitionType: execResult.Transition.Tag,
+			Metadata:       meta,
+			Timestamp:      now,
+		})
 	}
-	if tr.Worker != nil {
-		meta["spawned_agent_id"] = tr.Worker.ID
-	}
-	b.Emit(events.TransitionOccurred{
-		AgentID:        agentBefore.ID,
-		FromState:      agentBefore.CurrentState,
-		ToState:        toState,
-		TransitionType: execResult.Transition.Tag,
-		Metadata:       meta,
-		Timestamp:      time.Now(),
-	})
 
 	if tr.Agent == nil {
 		// Agent terminated.
@@ -1208,7 +1269,7 @@ func emitTransitionEvents(
 		b.Emit(events.AgentTerminated{
 			AgentID:       agentBefore.ID,
 			ResultPayload: payload,
-			Timestamp:     time.Now(),
+			Timestamp:     now,
 		})
 	} else if tr.Agent.Status == wfstate.AgentStatusPaused {
 		// Resolution or validation failure (e.g. fork-workflow target not
@@ -1218,7 +1279,7 @@ func emitTransitionEvents(
 			AgentID:   tr.Agent.ID,
 			Reason:    "validation_error",
 			Error:     tr.Agent.Error,
-			Timestamp: time.Now(),
+			Timestamp: now,
 		})
 	}
 	if tr.Worker != nil {
@@ -1226,7 +1287,7 @@ func emitTransitionEvents(
 			ParentAgentID: agentBefore.ID,
 			NewAgentID:    tr.Worker.ID,
 			InitialState:  tr.Worker.CurrentState,
-			Timestamp:     time.Now(),
+			Timestamp:     now,
 		})
 	}
 }
@@ -1398,18 +1459,21 @@ func applyMultiFork(
 		ws.Agents = append(ws.Agents, workers[i])
 	}
 
-	// Emit TransitionOccurred for the multi-fork.
-	b.Emit(events.TransitionOccurred{
-		AgentID:        agent.ID,
-		FromState:      fromState,
-		ToState:        continuation,
-		TransitionType: "multi-fork",
-		Metadata: map[string]any{
-			"state_type": stateType(fromState),
-			"fork_count": len(workers),
-		},
-		Timestamp: time.Now(),
-	})
+	// Emit TransitionOccurred for the multi-fork (skipping the metadata map
+	// when nothing listens, as in emitTransitionEvents).
+	if bus.HasHandlers[events.TransitionOccurred](b) {
+		b.Emit(events.TransitionOccurred{
+			AgentID:        agent.ID,
+			FromState:      fromState,
+			ToState:        continuation,
+			TransitionType: "multi-fork",
+			Metadata: map[string]any{
+				"state_type": stateType(fromState),
+				"fork_count": len(workers),
+			},
+			Timestamp: time.Now(),
+		})
+	}
 
 	// Emit AgentSpawned for each worker.
 	for i := range workers {
@@ -1496,55 +1560,41 @@ func handleStepError(
 	execCtx *executors.ExecutionContext,
 	b *bus.Bus,
 ) error {
-	agent := &ws.Agents[agentIdx]
+	policy, ok := classifyError(err)
+	if !ok {
+		// Fatal error (ScriptError, unexpected, etc.) — propagate.
+		return err
+	}
 
-	switch {
-	case isLimitError(err):
-		// Usage limit hit — pause immediately without retrying.
-		b.Emit(events.ErrorOccurred{
-			AgentID:      agent.ID,
-			ErrorType:    "ClaudeCodeLimitError",
-			ErrorMessage: err.Error(),
-			CurrentState: agent.CurrentState,
-			IsRetryable:  false,
-			RetryCount:   0,
-			MaxRetries:   0,
-			Timestamp:    time.Now(),
-		})
-		agent.Status = wfstate.AgentStatusPaused
-		agent.Error = err.Error()
-		b.Emit(events.AgentPaused{AgentID: agent.ID, Reason: events.PauseReasonUsageLimit, Error: agent.Error, Timestamp: time.Now()})
-		return nil
+	agent := &ws.Agents[agentIdx]
 
-	case isRetryableError(err):
-		// Transient error — retry up to MaxRetries.
+	// Non-retryable errors (usage limit) pause immediately; transient errors
+	// retry up to MaxRetries and pause once that is exceeded.
+	retryable := false
+	retryCount, maxRetries := 0, 0
+	if policy.retryable {
 		agent.RetryCount++
-		retryable := agent.RetryCount < MaxRetries
-
-		b.Emit(events.ErrorOccurred{
-			AgentID:      agent.ID,
-			ErrorType:    errorTypeName(err),
-			ErrorMessage: err.Error(),
-			CurrentState: agent.CurrentState,
-			IsRetryable:  retryable,
-			RetryCount:   agent.RetryCount,
-			MaxRetries:   MaxRetries,
-			Timestamp:    time.Now(),
-		})
-
-		if !retryable {
-			// Exceeded max retries — pause.
-			agent.Status = wfstate.AgentStatusPaused
-			agent.Error = err.Error()
-			reason := agentPausedReason(err)
-			b.Emit(events.AgentPaused{AgentID: agent.ID, Reason: reason, Error: agent.Error, Timestamp: time.Now()})
-		}
-		return nil
+		retryable = agent.RetryCount < MaxRetries
+		retryCount, maxRetries = agent.RetryCount, MaxRetries
+	}
+
+	b.Emit(events.ErrorOccurred{
+		AgentID:      agent.ID,
+		ErrorType:    policy.typeName,
+		ErrorMessage: err.Error(),
+		CurrentState: agent.CurrentState,
+		IsRetryable:  retryable,
+		RetryCount:   retryCount,
+		MaxRetries:   maxRetries,
+		Timestamp:    time.Now(),
+	})
 
-	default:
-		// Fatal error (ScriptError, unexpected, etc.) — propagate.
-		return err
+	if !retryable {
+		agent.Status = wfstate.AgentStatusPaused
+		agent.Error = err.Error()
+		b.Emit(events.AgentPaused{AgentID: agent.ID, Reason: policy.pauseReason, Error: agent.Error, Timestamp: time.Now()})
 	}
+	return nil
 }
 
 // resetPausedAgents clears the status/retry/error fields of all paused agents
@@ -1573,64 +1623,77 @@ func allPaused(agents []wfstate.AgentState) bool {
 	return true
 }
 
+// errorPolicy describes how handleStepError treats one class of executor error.
+type errorPolicy struct {
+	typeName    string // ErrorType reported in ErrorOccurred
+	retryable   bool   // retried up to MaxRetries; otherwise paused at once
+	pauseReason string // Reason reported in AgentPaused
+}
+
+// errorPolicies lists the handled executor error types in match order. Errors
+// matching none of them are fatal.
+var errorPolicies = []struct {
+	match  func(error) bool
+	policy errorPolicy
+}{
+	{isLimitError, errorPolicy{"ClaudeCodeLimitError", false, events.PauseReasonUsageLimit}},
+	{isTimeoutError, errorPolicy{"ClaudeCodeTimeoutWrappedError", true, events.PauseReasonTimeout}},
+	{errorIs[*executors.PromptFileError], errorPolicy{"PromptFileError", true, events.PauseReasonPromptError}},
+	{errorIs[*executors.ClaudeCodeError], errorPolicy{"ClaudeCodeError", true, events.PauseReasonClaudeError}},
+}
+
+// classifyError returns the policy for err from a single pass over
+// errorPolicies, or false when err is fatal.
+func classifyError(err error) (errorPolicy, bool) {
+	for _, p := range errorPolicies {
+		if p.match(err) {
+			return p.policy, true
+		}
+	}
+	return errorPolicy{}, false
+}
+
+// errorIs reports whether err's chain contains an error of type T.
+func errorIs[T error](err error) bool {
+	var target T
+	return errors.As(err, &target)
+}
+
 // isLimitError reports whether err is a ClaudeCodeLimitError.
 func isLimitError(err error) bool {
-	var le *executors.ClaudeCodeLimitError
-	return errors.As(err, &le)
+	return errorIs[*executors.ClaudeCodeLimitError](err)
 }
 
 // isTimeoutError reports whether err is a ClaudeCodeTimeoutWrappedError.
 func isTimeoutError(err error) bool {
-	var te *executors.ClaudeCodeTimeoutWrappedError
-	return errors.As(err, &te)
+	return errorIs[*executors.ClaudeCodeTimeoutWrappedError](err)
 }
 
 // isRetryableError reports whether err should trigger the retry mechanism.
 // Retryable: ClaudeCodeError, ClaudeCodeTimeoutWrappedError, PromptFileError.
-// NOT retryable: ScriptError (fatal).
+// NOT retryable: ScriptError (fatal), ClaudeCodeLimitError (paused).
 func isRetryableError(err error) bool {
-	var ce *executors.ClaudeCodeError
-	var te *executors.ClaudeCodeTimeoutWrappedError
-	var pe *executors.PromptFileError
-	return errors.As(err, &ce) || errors.As(err, &te) || errors.As(err, &pe)
+	p, ok := classifyError(err)
+	return ok && p.retryable
 }
 
 // agentPausedReason returns a short reason string for AgentPaused events that
 // distinguishes between timeout, prompt file errors, and Claude invocation errors.
 func agentPausedReason(err error) string {
-	var te *executors.ClaudeCodeTimeoutWrappedError
-	if errors.As(err, &te) {
-		return events.PauseReasonTimeout
-	}
-	var pe *executors.PromptFileError
-	if errors.As(err, &pe) {
-		return events.PauseReasonPromptError
+	if p, ok := classifyError(err); ok && p.retryable {
+		return p.pauseReason
 	}
 	return events.PauseReasonClaudeError
 }
 
-// errorTypeName returns a short type name string for use in ErrorOccurred events.
-func errorTypeName(err error) string {
-	var ce *executors.ClaudeCodeError
-	if errors.As(err, &ce) {
-		return "ClaudeCodeError"
-	}
-	var te *executors.ClaudeCodeTimeoutWrappedError
-	if errors.As(err, &te) {
-		return "ClaudeCodeTimeoutWrappedError"
-	}
-	var pe *executors.PromptFileError
-	if errors.As(err, &pe) {
-		return "PromptFileError"
-	}
-	return fmt.Sprintf("%T", err)
-}
-
 // stateType returns events.StateTypeScript for .sh/.bat files and
 // events.StateTypeMarkdown for everything else.
+//
+// Called for every transition event, so only the extension is lowercased
+// (which does not allocate when it is already lowercase), not the filename.
 func stateType(filename string) string {
-	lower := strings.ToLower(filename)
-	if strings.HasSuffix(lower, ".sh") || strings.HasSuffix(lower, ".bat") {
+	switch strings.ToLower(filepath.Ext(filename)) {
+	case ".sh", ".bat":
 		return events.StateTypeScript
 	}
 	return events.StateTypeMarkdown
@@ -1640,6 +1703,9 @@ func stateType(filename string) string {
 // the longest wait in seconds plus true, or (0, false) if any paused agent has
 // no parseable reset time or if no paused agents exist (e.g. all asking).
 func computeAutoWait(agents []wfstate.AgentState) (float64, bool) {
+	// One reference time for every agent, so agents paused by the same
+	// limit message compute the same wait.
+	now := time.Now()
 	var maxWait float64
 	found := false
 	for _, a := range agents {
@@ -1647,7 +1713,7 @@ func computeAutoWait(agents []wfstate.AgentState) (float64, bool) {
 			continue
 		}
 		found = true
-		wait, ok := parseLimitResetWait(a.Error)
+		wait, ok := parseResetWaitSeconds(a.Error, now, limitResetBufferMinutes)
 		if !ok {
 			return 0, false
 		}
@@ -1664,20 +1730,6 @@ func computeAutoWait(agents []wfstate.AgentState) (float64, bool) {
 // limitResetBufferMinutes is added after the stated reset time.
 const limitResetBufferMinutes = 5
 
-// parseLimitResetWait attempts to parse a usage-limit reset time from an error
-// message and returns the seconds to wait (plus buffer).
-//
-// The error message format expected by Claude Code is:
-//
-//	"… resets HH(am|pm) (Timezone/Name) …"
-//
-// Returns (0, false) when the message cannot be parsed or the timezone is unknown.
-func parseLimitResetWait(msg string) (float64, bool) {
-	// Delegate to the standalone helper so the logic is easy to unit-test.
-	secs, ok := parseResetWaitSeconds(msg, time.Now(), limitResetBufferMinutes)
-	return secs, ok
-}
-
 // scanForAskTransitions examines all state files in scopeDir for
 // allowed_transitions entries with tag "ask". Returns the list of state
 // filenames that declare ask transitions.
@@ -21,6 +21,7 @@ import (
 	"github.com/vector76/raymond/internal/bus"
 	"github.com/vector76/raymond/internal/events"
 	"github.com/vector76/raymond/internal/executors"
+	"github.com/vector76/raymond/internal/observers/debug"
 	"github.com/vector76/raymond/internal/orchestrator"
 	"github.com/vector76/raymond/internal/parsing"
 	"github.com/vector76/raymond/internal/specifier"
@@ -656,6 +657,56 @@ func TestScriptErrorIsFatal(t *testing.T) {
 	assert.True(t, errors.As(err, &se))
 }
 
+// streamThenFail is an executor that streams one object on the bus and then
+// fails with err.
+type streamThenFail struct{ err error }
+
+func (e streamThenFail) Execute(
+	_ context.Context,
+	agent *wfstate.AgentState,
+	_ *wfstate.WorkflowState,
+	execCtx *executors.ExecutionContext,
+) (executors.ExecutionResult, error) {
+	execCtx.Bus.Emit(events.ClaudeStreamOutput{
+		AgentID: agent.ID, StateName: agent.CurrentState, StepNumber: 1,
+		JSONObject: map[string]any{"type": "assistant"}, Timestamp: time.Now(),
+	})
+	return executors.ExecutionResult{}, e.err
+}
+
+func TestFatalErrorFlushesDebugOutput(t *testing.T) {
+	dir, wfID := setupWorkflow(t, "START.md")
+
+	orchestrator.SetExecutorFactory(func(_ string) executors.StateExecutor {
+		return streamThenFail{err: &executors.ScriptError{Msg: "exit code 1"}}
+	})
+	defer orchestrator.ResetExecutorFactory()
+
+	var debugDir string
+	var ended []events.WorkflowEnded
+	orchestrator.SetBusHook(func(b *bus.Bus) {
+		bus.Subscribe(b, func(e events.WorkflowStarted) { debugDir = e.DebugDir })
+		bus.Subscribe(b, func(e events.WorkflowEnded) { ended = append(ended, e) })
+	})
+	defer orchestrator.ResetBusHook()
+
+	// The observer is never closed, as in the CLI and daemon.
+	opts := defaultOpts(dir)
+	opts.Debug = true
+	opts.ObserverSetup = func(b *bus.Bus) { debug.New(b) }
+
+	// A fatal error emits neither WorkflowCompleted nor WorkflowPaused; the
+	// buffered stream line must still be on disk when RunAllAgents returns.
+	err := orchestrator.RunAllAgents(context.Background(), wfID, opts)
+	require.Error(t, err)
+	require.Len(t, ended, 1)
+	require.NotEmpty(t, debugDir)
+
+	data, err := os.ReadFile(filepath.Join(debugDir, "main_START_001.jsonl"))
+	require.NoError(t, err)
+	assert.Equal(t, "{\"type\":\"assistant\"}\n", string(data))
+}
+
 // ----------------------------------------------------------------------------
 // Error handling: PromptFileError → retry, then pause
 // ----------------------------------------------------------------------------
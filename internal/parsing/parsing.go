@@ -14,15 +14,11 @@ import (
 // locate the corresponding closing tag with a plain string search.
 var openTagRe = regexp.MustCompile(`<(call-workflow|function-workflow|fork-workflow|reset-workflow|goto|reset|function|call|fork|result|ask)([^>]*)>`)
 
-// attrRe matches key="value" or key='value' attribute pairs.
-// Two alternatives enforce matching quote characters so key="val' is rejected.
-var attrRe = regexp.MustCompile(`(\w+)=(?:"([^"]*)"|'([^']*)')`)
-
 // Transition represents a single transition tag parsed from agent output.
 type Transition struct {
 	Tag        string
 	Target     string            // filename; empty for result tags
-	Attributes map[string]string // e.g. {"return": "NEXT.md"}
+	Attributes map[string]string // e.g. {"return": "NEXT.md"}; nil when the tag has none
 	Payload    string            // content between tags; used by result and ask tags
 
 	// FileAffordance is the parsed file descriptor for <ask> transitions.
@@ -36,6 +32,12 @@ type Transition struct {
 // ignored. Returns an error if a non-result tag has an empty target or a
 // target containing a path separator (/ or \).
 func ParseTransitions(output string) ([]Transition, error) {
+	// Every recognized tag needs a closing tag, so output without "</" (most
+	// agent prose) cannot contain one; skip the regex scan entirely.
+	if !strings.Contains(output, "</") {
+		return nil, nil
+	}
+
 	var transitions []Transition
 
 	for _, match := range openTagRe.FindAllStringSubmatchIndex(output, -1) {
@@ -105,22 +107,56 @@ func ParseTransitions(output string) ([]Transition, error) {
 }
 
 // parseAttributes parses HTML-style key="value" or key='value' pairs.
-// The regex uses two alternatives to enforce matching quotes:
-// group 2 captures the value for double-quoted attributes,
-// group 3 captures the value for single-quoted attributes.
+//
+// The attribute string is scanned by hand rather than with a regex: each
+// '=' is a candidate, its key is the run of word characters (ASCII letters,
+// digits, '_') immediately before it, and its value runs from the opening
+// quote to the next quote of the same kind, so key="val' is rejected.
+// Candidates without a key or a closed quote are skipped; scanning resumes
+// after each accepted value.
+//
+// Most tags carry no attributes, so a string without '=' returns a nil map
+// (which reads as empty) without allocating.
 func parseAttributes(attrsStr string) map[string]string {
+	if strings.IndexByte(attrsStr, '=') < 0 {
+		return nil
+	}
 	attrs := make(map[string]string)
-	for _, m := range attrRe.FindAllStringSubmatch(attrsStr, -1) {
-		// m[2] is non-empty for double-quoted values; m[3] for single-quoted.
-		value := m[2]
-		if value == "" && m[3] != "" {
-			value = m[3]
+	for i := 0; i < len(attrsStr); {
+		eq := strings.IndexByte(attrsStr[i:], '=')
+		if eq < 0 {
+			break
+		}
+		eq += i
+		i = eq + 1
+
+		keyStart := eq
+		for keyStart > 0 && isWordByte(attrsStr[keyStart-1]) {
+			keyStart--
 		}
-		attrs[m[1]] = value
+		if keyStart == eq || eq+1 >= len(attrsStr) {
+			continue
+		}
+		quote := attrsStr[eq+1]
+		if quote != '"' && quote != '\'' {
+			continue
+		}
+		end := strings.IndexByte(attrsStr[eq+2:], quote)
+		if end < 0 {
+			continue
+		}
+		end += eq + 2
+		attrs[attrsStr[keyStart:eq]] = attrsStr[eq+2 : end]
+		i = end + 1
 	}
 	return attrs
 }
 
+// isWordByte reports whether c is a word character (the ASCII \w class).
+func isWordByte(c byte) bool {
+	return c == '_' || '0' <= c && c <= '9' || 'a' <= c && c <= 'z' || 'A' <= c && c <= 'Z'
+}
+
 // ValidateSingleTransition returns an error if transitions does not contain
 // exactly one element. The caller is responsible for deciding how to respond
 // (e.g. send a reminder prompt to the agent).
@@ -139,14 +175,19 @@ func IsWorkflowTag(tag string) bool {
 	return tag == "call-workflow" || tag == "function-workflow" || tag == "fork-workflow" || tag == "reset-workflow"
 }
 
+// stateExtensions lists the recognized state file extensions in match order.
+var stateExtensions = [...]string{".md", ".sh", ".bat", ".ps1"}
+
 // ExtractStateName strips the recognized state file extension (.md, .sh, .bat, .ps1)
 // from filename, case-insensitively. If no recognized extension is present the
 // filename is returned unchanged. Case of the base name is preserved.
+//
+// Called per event by observers and per target by lint/convert, so the suffix
+// is compared in place with EqualFold instead of lowercasing a copy of filename.
 func ExtractStateName(filename string) string {
-	lower := strings.ToLower(filename)
-	for _, ext := range []string{".md", ".sh", ".bat", ".ps1"} {
-		if strings.HasSuffix(lower, ext) {
-			return filename[:len(filename)-len(ext)]
+	for _, ext := range stateExtensions {
+		if n := len(filename) - len(ext); n >= 0 && strings.EqualFold(filename[n:], ext) {
+			return filename[:n]
 		}
 	}
 	return filename
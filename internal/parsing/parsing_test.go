@@ -94,6 +94,13 @@ func TestZeroTagsReturnsEmpty(t *testing.T) {
 	assert.Empty(t, transitions)
 }
 
+func TestOpenTagWithoutCloseReturnsEmpty(t *testing.T) {
+	output := "Considering <goto>NEXT.md but never closing it"
+	transitions, err := parsing.ParseTransitions(output)
+	require.NoError(t, err)
+	assert.Empty(t, transitions)
+}
+
 func TestMultipleTagsReturnsAll(t *testing.T) {
 	output := "<goto>A.md</goto>\n<goto>B.md</goto>"
 	transitions, err := parsing.ParseTransitions(output)
@@ -163,6 +170,30 @@ func TestMultipleAttributes(t *testing.T) {
 	assert.Equal(t, map[string]string{"next": "X.md", "item": "foo", "priority": "high"}, transitions[0].Attributes)
 }
 
+func TestTagWithoutAttributesHasNilMap(t *testing.T) {
+	transitions, err := parsing.ParseTransitions("<goto >NEXT.md</goto>")
+	require.NoError(t, err)
+	require.Len(t, transitions, 1)
+	assert.Nil(t, transitions[0].Attributes)
+	assert.Equal(t, "", transitions[0].Attributes["return"], "nil map reads as empty")
+}
+
+func TestAttributesMismatchedQuotesSkipped(t *testing.T) {
+	output := `<fork next="X.md' item='foo'>Y.md</fork>`
+	transitions, err := parsing.ParseTransitions(output)
+	require.NoError(t, err)
+	require.Len(t, transitions, 1)
+	assert.Equal(t, map[string]string{"item": "foo"}, transitions[0].Attributes)
+}
+
+func TestAttributeValueMayContainEquals(t *testing.T) {
+	output := `<fork next="X.md" item="a=b">Y.md</fork>`
+	transitions, err := parsing.ParseTransitions(output)
+	require.NoError(t, err)
+	require.Len(t, transitions, 1)
+	assert.Equal(t, map[string]string{"next": "X.md", "item": "a=b"}, transitions[0].Attributes)
+}
+
 func TestEmptyResultTag(t *testing.T) {
 	output := "<result></result>"
 	transitions, err := parsing.ParseTransitions(output)
@@ -465,3 +496,19 @@ func TestParseAskEmptyContent(t *testing.T) {
 	assert.Equal(t, "TARGET.md", tr.Target)
 	assert.Equal(t, "", tr.Payload)
 }
+
+// ----------------------------------------------------------------------------
+// ExtractStateName
+// ----------------------------------------------------------------------------
+
+func TestExtractStateNameMixedCaseExtension(t *testing.T) {
+	assert.Equal(t, "Start", parsing.ExtractStateName("Start.Md"))
+	assert.Equal(t, "check", parsing.ExtractStateName("check.sH"))
+	assert.Equal(t, "Étape", parsing.ExtractStateName("Étape.BAT"))
+}
+
+func TestExtractStateNameUnrecognizedOrShort(t *testing.T) {
+	assert.Equal(t, "notes.txt", parsing.ExtractStateName("notes.txt"))
+	assert.Equal(t, "md", parsing.ExtractStateName("md"))
+	assert.Equal(t, "", parsing.ExtractStateName(".md"))
+}
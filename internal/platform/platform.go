@@ -180,11 +180,12 @@ func RunScript(ctx context.Context, scriptPath string, timeout float64, env map[
 		for {
 			n, readErr := pipe.Read(scratch)
 			if n > 0 {
-				chunk := make([]byte, n)
-				copy(chunk, scratch[:n])
-				*buf = append(*buf, chunk...)
+				*buf = append(*buf, scratch[:n]...)
 				signalActivity()
 				if onChunk != nil {
+					// onChunk may retain data, so hand it a private copy.
+					chunk := make([]byte, n)
+					copy(chunk, scratch[:n])
 					onChunk(pipeName, chunk)
 				}
 			}
@@ -236,22 +237,27 @@ func RunScript(ctx context.Context, scriptPath string, timeout float64, env map[
 // mergeEnv builds a []string environment from os.Environ() overridden by extra.
 // CLAUDECODE is stripped so that script subprocesses cannot accidentally treat
 // themselves as nested Claude sessions (mirrors the behaviour in ccwrap.BuildClaudeEnv).
+//
+// This runs once per script spawn, so the parent environment is snapshotted a
+// single time and filtered in place rather than round-tripped through a map.
 func mergeEnv(extra map[string]string) []string {
-	base := make(map[string]string, len(os.Environ()))
-	for _, kv := range os.Environ() {
-		if idx := strings.IndexByte(kv, '='); idx >= 0 {
-			k := kv[:idx]
-			if k == "CLAUDECODE" {
-				continue
-			}
-			base[k] = kv[idx+1:]
+	environ := os.Environ()
+	result := make([]string, 0, len(environ)+len(extra))
+	for _, kv := range environ {
+		idx := strings.IndexByte(kv, '=')
+		if idx < 0 {
+			continue
+		}
+		k := kv[:idx]
+		if k == "CLAUDECODE" {
+			continue
 		}
+		if _, overridden := extra[k]; overridden {
+			continue
+		}
+		result = append(result, kv)
 	}
 	for k, v := range extra {
-		base[k] = v
-	}
-	result := make([]string, 0, len(base))
-	for k, v := range base {
 		result = append(result, k+"="+v)
 	}
 	return result
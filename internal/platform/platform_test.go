@@ -492,6 +492,22 @@ func TestRunScriptStripsClaudeCodeFromEnv(t *testing.T) {
 		"CLAUDECODE should be stripped from the child process environment")
 }
 
+// TestRunScriptSuppliedEnvOverridesParent verifies that a key present in both
+// the parent environment and the supplied env map reaches the child exactly
+// once, with the supplied value.
+func TestRunScriptSuppliedEnvOverridesParent(t *testing.T) {
+	skipUnix(t)
+	t.Setenv("RAYMOND_TEST_OVERRIDE", "parent")
+
+	dir := t.TempDir()
+	script := writeScript(t, dir, "test.sh", "#!/bin/bash\nenv | grep '^RAYMOND_TEST_OVERRIDE='\n")
+
+	env := map[string]string{"RAYMOND_TEST_OVERRIDE": "child"}
+	result, err := platform.RunScript(context.Background(), script, 0, env, "", nil)
+	require.NoError(t, err)
+	assert.Equal(t, "RAYMOND_TEST_OVERRIDE=child\n", result.Stdout)
+}
+
 // ----------------------------------------------------------------------------
 // RunScript — inactivity timeout and streaming
 // ----------------------------------------------------------------------------
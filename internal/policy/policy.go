@@ -4,9 +4,9 @@ import (
 	"fmt"
 	"path/filepath"
 	"reflect"
-	"regexp"
 	"sort"
 	"strings"
+	"sync"
 
 	"gopkg.in/yaml.v3"
 
@@ -21,13 +21,6 @@ var stateExtensions = map[string]bool{
 	".ps1": true,
 }
 
-// Frontmatter delimiter patterns anchored to the start of content.
-// Go RE2 supports (?s) to make . match newlines.
-var (
-	frontmatterRe      = regexp.MustCompile(`(?s)^---[ \t]*\n(.+?)\n---[ \t]*\n`)
-	emptyFrontmatterRe = regexp.MustCompile(`^---[ \t]*\n---[ \t]*\n`)
-)
-
 // Policy represents a workflow state's transition policy parsed from YAML frontmatter.
 type Policy struct {
 	AllowedTransitions []map[string]string // each entry has at least "tag"
@@ -76,21 +69,40 @@ func (e *PolicyViolationError) Error() string { return e.msg }
 // Returns (nil, body, nil) when frontmatter is empty or contains only null/empty YAML.
 // Returns (*Policy, body, nil) on success.
 // Returns (nil, "", error) when frontmatter contains invalid YAML.
+//
+// The same state file is read on every visit, so parsed policies are cached
+// by frontmatter text. Each caller gets its own copy and may modify it.
 func ParseFrontmatter(content string) (*Policy, string, error) {
 	// Normalize Windows line endings so the regex works regardless of how the
 	// file was checked out. Python's text-mode file I/O does this automatically;
 	// Go's os.ReadFile reads raw bytes, so we do it explicitly here.
 	content = strings.ReplaceAll(content, "\r\n", "\n")
 
-	// Try non-empty frontmatter first.
-	if m := frontmatterRe.FindStringSubmatchIndex(content); m != nil {
-		yamlContent := content[m[2]:m[3]]
-		body := content[m[1]:]
+	start := fenceEnd(content, 0)
+	if start < 0 {
+		// No frontmatter.
+		return nil, content, nil
+	}
+
+	// Try non-empty frontmatter first: the closing fence is the first
+	// "---" line that leaves at least one byte of YAML before it.
+	for i := start + 1; i < len(content); i++ {
+		k := strings.Index(content[i:], "\n---")
+		if k < 0 {
+			break
+		}
+		i += k
+		end := fenceEnd(content, i+1)
+		if end < 0 {
+			continue
+		}
+		yamlContent := content[start:i]
+		body := content[end:]
 
 		if strings.TrimSpace(yamlContent) == "" {
 			return nil, body, nil
 		}
-		p, err := parseYAML(yamlContent)
+		p, err := parseYAMLCached(yamlContent)
 		if err != nil {
 			return nil, "", err
 		}
@@ -98,14 +110,33 @@ func ParseFrontmatter(content string) (*Policy, string, error) {
 	}
 
 	// Try empty frontmatter (--- immediately followed by ---).
-	if m := emptyFrontmatterRe.FindStringIndex(content); m != nil {
-		return nil, content[m[1]:], nil
+	if end := fenceEnd(content, start); end >= 0 {
+		return nil, content[end:], nil
 	}
 
-	// No frontmatter.
+	// Unterminated frontmatter is treated as no frontmatter.
 	return nil, content, nil
 }
 
+// fenceEnd reports whether a frontmatter fence line ("---", optional spaces
+// or tabs, newline) starts at content[i:], returning the offset just past its
+// newline, or -1 if there is none. Fences are found with plain string scans
+// rather than a regex: most state files have no frontmatter, and those that
+// do would otherwise run a lazy match across the whole body.
+func fenceEnd(content string, i int) int {
+	if !strings.HasPrefix(content[i:], "---") {
+		return -1
+	}
+	j := i + len("---")
+	for j < len(content) && (content[j] == ' ' || content[j] == '\t') {
+		j++
+	}
+	if j < len(content) && content[j] == '\n' {
+		return j + 1
+	}
+	return -1
+}
+
 // yamlFrontmatter is the intermediate struct for YAML unmarshaling.
 type yamlFrontmatter struct {
 	AllowedTransitions []map[string]string `yaml:"allowed_transitions"`
@@ -114,11 +145,83 @@ type yamlFrontmatter struct {
 	ForceImplicit      bool                `yaml:"force_implicit"`
 }
 
+// maxCachedPolicies bounds policyCache; a long-running daemon may see many
+// distinct state files over its lifetime.
+const maxCachedPolicies = 256
+
+// policyCache memoizes parseYAML by frontmatter text.
+var policyCache = struct {
+	sync.Mutex
+	m map[string]policyCacheEntry
+}{m: make(map[string]policyCacheEntry)}
+
+type policyCacheEntry struct {
+	p   *Policy
+	err error
+}
+
+// parseYAMLCached is parseYAML with results (including errors) cached in
+// policyCache. The cache is dropped wholesale when it reaches
+// maxCachedPolicies; workflows revisit a small set of states, so it refills
+// quickly. The cached Policy is never handed out: callers such as convert
+// rewrite transition entries in place, so every call returns a fresh copy.
+func parseYAMLCached(yamlContent string) (*Policy, error) {
+	policyCache.Lock()
+	e, ok := policyCache.m[yamlContent]
+	policyCache.Unlock()
+	if ok {
+		return e.p.clone(), e.err
+	}
+
+	p, err := parseYAML(yamlContent)
+
+	policyCache.Lock()
+	if len(policyCache.m) >= maxCachedPolicies {
+		policyCache.m = make(map[string]policyCacheEntry)
+	}
+	// Clone the key: yamlContent is a slice of the whole file content.
+	policyCache.m[strings.Clone(yamlContent)] = policyCacheEntry{p: p, err: err}
+	policyCache.Unlock()
+	return p.clone(), err
+}
+
+// clone returns a deep copy of p, or nil if p is nil.
+func (p *Policy) clone() *Policy {
+	if p == nil {
+		return nil
+	}
+	c := *p
+	if p.AllowedTransitions != nil {
+		c.AllowedTransitions = make([]map[string]string, len(p.AllowedTransitions))
+		for i, entry := range p.AllowedTransitions {
+			m := make(map[string]string, len(entry))
+			for k, v := range entry {
+				m[k] = v
+			}
+			c.AllowedTransitions[i] = m
+		}
+	}
+	if p.UnknownFields != nil {
+		c.UnknownFields = append([]string(nil), p.UnknownFields...)
+	}
+	return &c
+}
+
 // parseYAML converts a YAML string into a Policy, or nil if the document is empty.
 func parseYAML(yamlContent string) (*Policy, error) {
+	// Parse once into a node tree; both decodes below work from the tree
+	// rather than re-scanning the text.
+	var doc yaml.Node
+	if err := yaml.Unmarshal([]byte(yamlContent), &doc); err != nil {
+		return nil, fmt.Errorf("Invalid YAML frontmatter: %w", err)
+	}
+	if len(doc.Content) == 0 {
+		return nil, nil
+	}
+
 	// First check whether the document is null / empty (matches Python's `if not data`).
 	var raw interface{}
-	if err := yaml.Unmarshal([]byte(yamlContent), &raw); err != nil {
+	if err := doc.Decode(&raw); err != nil {
 		return nil, fmt.Errorf("Invalid YAML frontmatter: %w", err)
 	}
 	if raw == nil {
@@ -129,7 +232,7 @@ func parseYAML(yamlContent string) (*Policy, error) {
 	}
 
 	var data yamlFrontmatter
-	if err := yaml.Unmarshal([]byte(yamlContent), &data); err != nil {
+	if err := doc.Decode(&data); err != nil {
 		return nil, fmt.Errorf("Invalid YAML frontmatter: %w", err)
 	}
 
@@ -186,10 +289,13 @@ func TargetsMatch(policyTarget, transitionTarget string) bool {
 		return false
 	}
 
-	// Abstract target: check stem equality and valid extension.
-	transitionExt := strings.ToLower(filepath.Ext(transitionTarget))
-	transitionStem := strings.TrimSuffix(transitionTarget, filepath.Ext(transitionTarget))
-	return transitionStem == policyTarget && stateExtensions[transitionExt]
+	// Abstract target: check stem equality and valid extension. The
+	// extension is scanned once, and only lowercased when the stem matches.
+	transitionExt := filepath.Ext(transitionTarget)
+	if transitionTarget[:len(transitionTarget)-len(transitionExt)] != policyTarget {
+		return false
+	}
+	return stateExtensions[strings.ToLower(transitionExt)]
 }
 
 // ShouldUseReminderPrompt reports whether a reminder prompt should be sent to
@@ -329,10 +435,15 @@ func GetImplicitTransition(p *Policy) (parsing.Transition, error) {
 			Payload: allowed["payload"],
 		}, nil
 	}
-	attrs := make(map[string]string)
-	for k, v := range allowed {
-		if k != "tag" && k != "target" {
-			attrs[k] = v
+	// The rule holds tag and target plus the attributes, so the map can be
+	// sized exactly; like parsed tags, a rule without attributes gets nil.
+	var attrs map[string]string
+	if n := len(allowed) - 2; n > 0 {
+		attrs = make(map[string]string, n)
+		for k, v := range allowed {
+			if k != "tag" && k != "target" {
+				attrs[k] = v
+			}
 		}
 	}
 	return parsing.Transition{
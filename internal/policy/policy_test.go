@@ -71,6 +71,25 @@ func TestParseFrontmatterEmptyFrontmatter(t *testing.T) {
 	assert.Contains(t, body, "Content here.")
 }
 
+func TestParseFrontmatterFencesAllowTrailingBlanks(t *testing.T) {
+	content := "--- \t\nmodel: opus\n---\t \n# Prompt"
+
+	p, body, err := policy.ParseFrontmatter(content)
+	require.NoError(t, err)
+	require.NotNil(t, p)
+	assert.Equal(t, "opus", p.Model)
+	assert.Equal(t, "# Prompt", body)
+}
+
+func TestParseFrontmatterUnterminatedIsBody(t *testing.T) {
+	content := "---\nmodel: opus\n# Prompt without closing fence"
+
+	p, body, err := policy.ParseFrontmatter(content)
+	require.NoError(t, err)
+	assert.Nil(t, p)
+	assert.Equal(t, content, body)
+}
+
 func TestParseFrontmatterMixedFormat(t *testing.T) {
 	content := "---\nallowed_transitions:\n  - { tag: goto, target: NEXT.md }\n  - tag: call\n    target: RESEARCH.md\n    return: SUMMARIZE.md\n  - { tag: result }\n---\n# Prompt\nContent."
 
@@ -99,6 +118,38 @@ func TestParseFrontmatterMalformedYAML(t *testing.T) {
 	assert.Contains(t, err.Error(), "Invalid YAML frontmatter")
 }
 
+func TestParseFrontmatterCachedPolicyUnaffectedByCallerEdits(t *testing.T) {
+	front := "---\nallowed_transitions:\n  - { tag: goto, target: CACHED.md }\n---\n"
+
+	p1, body1, err := policy.ParseFrontmatter(front + "# First body")
+	require.NoError(t, err)
+	require.NotNil(t, p1)
+	assert.Equal(t, "# First body", body1)
+
+	// Callers such as convert rewrite entries in place.
+	p1.AllowedTransitions[0]["target"] = "CACHED"
+	p1.AllowedTransitions = append(p1.AllowedTransitions, map[string]string{"tag": "result"})
+	p1.Model = "haiku"
+
+	p2, body2, err := policy.ParseFrontmatter(front + "# Second body")
+	require.NoError(t, err)
+	require.NotNil(t, p2)
+	assert.Equal(t, []map[string]string{{"tag": "goto", "target": "CACHED.md"}}, p2.AllowedTransitions)
+	assert.Empty(t, p2.Model)
+	assert.Equal(t, "# Second body", body2)
+}
+
+func TestParseFrontmatterMalformedYAMLErrorsEveryTime(t *testing.T) {
+	content := "---\nallowed_transitions: [fork\n---\n# Prompt\nContent."
+
+	for i := 0; i < 2; i++ {
+		p, body, err := policy.ParseFrontmatter(content)
+		require.Error(t, err)
+		assert.Nil(t, p)
+		assert.Empty(t, body)
+	}
+}
+
 func TestParseFrontmatterInvalidEntrySkipped(t *testing.T) {
 	// Entry missing "tag" key should be silently skipped
 	content := "---\nallowed_transitions:\n  - { tag: goto, target: NEXT.md }\n  - { target: MISSING_TAG.md }\n  - { tag: result }\n---\n# Prompt\nContent."
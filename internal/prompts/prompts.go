@@ -28,7 +28,6 @@ import (
 	"fmt"
 	"os"
 	"path/filepath"
-	"sort"
 	"strings"
 
 	"github.com/vector76/raymond/internal/platform"
@@ -96,30 +95,46 @@ func LoadPrompt(scopeDir, filename string) (string, *policy.Policy, error) {
 // converted with fmt.Sprintf("%v", value). Placeholders with no matching key
 // are left unchanged.
 //
-// Keys are sorted longest-first before substitution so that longer key names
-// (e.g. "firstname") are replaced before shorter ones that are substrings of
-// them (e.g. "name"), giving deterministic results regardless of map iteration
-// order.
+// The template is scanned once, left to right, and each placeholder is
+// looked up directly, so the cost does not grow with the number of
+// variables. Substituted values are copied verbatim and never re-scanned: a
+// value that itself contains "{{key}}" is not expanded further.
 func RenderPrompt(template string, variables map[string]any) string {
-	keys := make([]string, 0, len(variables))
-	for k := range variables {
-		keys = append(keys, k)
-	}
-	sort.Slice(keys, func(i, j int) bool { return len(keys[i]) > len(keys[j]) })
-
-	result := template
-	for _, key := range keys {
-		value := variables[key]
-		placeholder := "{{" + key + "}}"
-		var str string
-		if s, ok := value.(string); ok {
-			str = s
+	if len(variables) == 0 || !strings.Contains(template, "{{") {
+		return template
+	}
+
+	var b strings.Builder
+	b.Grow(len(template))
+	rest := template
+	for {
+		open := strings.Index(rest, "{{")
+		if open < 0 {
+			break
+		}
+		end := strings.Index(rest[open+2:], "}}")
+		if end < 0 {
+			break
+		}
+		key := rest[open+2 : open+2+end]
+		value, ok := variables[key]
+		if !ok {
+			// Not a placeholder we know: keep the text and resume one byte
+			// on, so "{{{name}}}" still finds "{{name}}".
+			b.WriteString(rest[:open+1])
+			rest = rest[open+1:]
+			continue
+		}
+		b.WriteString(rest[:open])
+		if str, ok := value.(string); ok {
+			b.WriteString(str)
 		} else {
-			str = fmt.Sprintf("%v", value)
+			fmt.Fprintf(&b, "%v", value)
 		}
-		result = strings.ReplaceAll(result, placeholder, str)
+		rest = rest[open+2+end+2:]
 	}
-	return result
+	b.WriteString(rest)
+	return b.String()
 }
 
 // ResolveState maps stateName to a concrete filename inside scopeDir.
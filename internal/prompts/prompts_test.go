@@ -249,6 +249,33 @@ func TestRenderPrompt_NonStringValue(t *testing.T) {
 	}
 }
 
+func TestRenderPrompt_SubstringKeyNames(t *testing.T) {
+	result := RenderPrompt("{{firstname}} / {{name}}", map[string]any{
+		"name":      "Smith",
+		"firstname": "Jane",
+	})
+	if result != "Jane / Smith" {
+		t.Errorf("got %q", result)
+	}
+}
+
+func TestRenderPrompt_ValuesAreNotReexpanded(t *testing.T) {
+	result := RenderPrompt("Result: {{input}}", map[string]any{
+		"input":    "literal {{agent_id}} in output",
+		"agent_id": "main",
+	})
+	if result != "Result: literal {{agent_id}} in output" {
+		t.Errorf("got %q", result)
+	}
+}
+
+func TestRenderPrompt_ExtraBraces(t *testing.T) {
+	result := RenderPrompt("{{{name}}} and {{ {{name}}", map[string]any{"name": "Eve"})
+	if result != "{Eve} and {{ Eve" {
+		t.Errorf("got %q", result)
+	}
+}
+
 // --------------------------------------------------------------------------
 // ResolveState — cross-platform
 // --------------------------------------------------------------------------
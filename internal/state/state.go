@@ -27,6 +27,7 @@
 package state
 
 import (
+	"bytes"
 	"encoding/json"
 	"errors"
 	"fmt"
@@ -313,7 +314,36 @@ func WriteState(workflowID string, ws *WorkflowState, stateDir string) error {
 	return WriteStateIn(workflowID, ws, PoolCLI, stateDir)
 }
 
+// MarshalState returns the exact bytes WriteStateIn stores for ws. Encoding
+// is deterministic (map keys are sorted), so callers that persist the same
+// workflow repeatedly can compare encodings and skip unchanged writes; see
+// WriteStateData.
+func MarshalState(ws *WorkflowState) ([]byte, error) {
+	var buf bytes.Buffer
+	enc := json.NewEncoder(&buf)
+	enc.SetIndent("", "  ")
+	if err := enc.Encode(ws); err != nil {
+		return nil, err
+	}
+	return buf.Bytes(), nil
+}
+
+// WriteStateData atomically writes data, as returned by MarshalState, as the
+// CLI-pool state file for workflowID. stateDir is interpreted as in
+// WriteState.
+func WriteStateData(workflowID string, data []byte, stateDir string) error {
+	return writeStateDataToDir(workflowID, data, ResolvePoolDir(PoolCLI, stateDir))
+}
+
 func writeStateToDir(workflowID string, ws *WorkflowState, dir string) error {
+	data, err := MarshalState(ws)
+	if err != nil {
+		return fmt.Errorf("failed to write state: %w", err)
+	}
+	return writeStateDataToDir(workflowID, data, dir)
+}
+
+func writeStateDataToDir(workflowID string, data []byte, dir string) error {
 	if err := os.MkdirAll(dir, 0o755); err != nil {
 		return fmt.Errorf("failed to create state directory %s: %w", dir, err)
 	}
@@ -327,9 +357,7 @@ func writeStateToDir(workflowID string, ws *WorkflowState, dir string) error {
 	tmpName := tmp.Name()
 
 	writeErr := func() error {
-		enc := json.NewEncoder(tmp)
-		enc.SetIndent("", "  ")
-		if err := enc.Encode(ws); err != nil {
+		if _, err := tmp.Write(data); err != nil {
 			return err
 		}
 		return tmp.Close()
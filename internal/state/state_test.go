@@ -64,6 +64,33 @@ func TestWriteStateJSONIsValid(t *testing.T) {
 	assert.Equal(t, "workflows/test", got["scope_dir"])
 }
 
+func TestWriteStateDataMatchesWriteState(t *testing.T) {
+	dir := stateDir(t)
+	ws := &state.WorkflowState{
+		WorkflowID:   "test-data",
+		ScopeDir:     "workflows/test",
+		ForkCounters: map[string]int{"main": 2, "main_w1": 1},
+		Agents: []state.AgentState{
+			{ID: "main", CurrentState: "START.md", Stack: []state.StackFrame{}},
+		},
+	}
+
+	require.NoError(t, state.WriteState("via-struct", ws, dir))
+	data, err := state.MarshalState(ws)
+	require.NoError(t, err)
+	require.NoError(t, state.WriteStateData("via-data", data, dir))
+
+	fromStruct, err := os.ReadFile(filepath.Join(dir, "via-struct.json"))
+	require.NoError(t, err)
+	fromData, err := os.ReadFile(filepath.Join(dir, "via-data.json"))
+	require.NoError(t, err)
+	assert.Equal(t, string(fromStruct), string(fromData))
+
+	again, err := state.MarshalState(ws)
+	require.NoError(t, err)
+	assert.Equal(t, string(data), string(again), "encoding must be deterministic")
+}
+
 func TestReadStateReturnsWritten(t *testing.T) {
 	dir := stateDir(t)
 	sid := "sess-abc"
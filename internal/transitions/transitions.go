@@ -14,7 +14,7 @@
 //   - fork-workflow:     non-blocking cross-workflow spawn; fresh session, cd allowed
 //   - reset-workflow:    cross-workflow reset; clears session and stack, cd allowed
 //
-// The primary entry point is ApplyTransition, which deep-copies the agent,
+// The primary entry point is ApplyTransition, which clones the agent,
 // clears transient fields, and dispatches to the appropriate handler.
 package transitions
 
@@ -22,8 +22,11 @@ import (
 	"fmt"
 	"os"
 	"path/filepath"
+	"strconv"
 	"strings"
 	"time"
+	"unicode/utf8"
+	"unique"
 
 	"github.com/vector76/raymond/internal/parsing"
 	"github.com/vector76/raymond/internal/prompts"
@@ -47,6 +50,10 @@ type TransitionResult struct {
 // If cdValue is absolute it is normalised and returned as-is.
 // If cdValue is relative it is resolved against baseCwd; when baseCwd is ""
 // (agent has no cwd set) the process's current working directory is used.
+//
+// The working directory is looked up on every call rather than cached: the
+// process may chdir between transitions. filepath.Join already cleans its
+// result, and Clean returns an already-clean path without allocating.
 func ResolveCd(cdValue, baseCwd string) string {
 	if filepath.IsAbs(cdValue) {
 		return filepath.Clean(cdValue)
@@ -55,13 +62,13 @@ func ResolveCd(cdValue, baseCwd string) string {
 	if base == "" {
 		base, _ = os.Getwd()
 	}
-	return filepath.Clean(filepath.Join(base, cdValue))
+	return filepath.Join(base, cdValue)
 }
 
 // ApplyTransition applies a transition to an agent and returns the result.
 //
 // Steps:
-//  1. Deep-copies the agent (original is never mutated).
+//  1. Clones the agent (original is never mutated).
 //  2. Clears transient fields (PendingResult, ForkSessionID, ForkAttributes).
 //  3. Dispatches to the appropriate handler based on transition.Tag.
 //
@@ -84,20 +91,20 @@ func ApplyTransition(
 	wfState *wfstate.WorkflowState,
 	fetch specifier.Fetcher,
 ) (TransitionResult, error) {
-	// Deep copy — handlers must not mutate the original agent.
-	copy := deepCopyAgent(*agent)
+	// A result with an empty stack terminates the agent: the handler would
+	// discard the clone, so skip building one.
+	if transition.Tag == "result" && len(agent.Stack) == 0 {
+		return terminate(agent.ID, transition.Payload, wfState), nil
+	}
 
 	// Save transient fields before clearing — used for input template rendering
-	// in the cross-workflow transition cases below.
-	origPendingResult := copy.PendingResult
-	origForkAttributes := copy.ForkAttributes
+	// in the cross-workflow transition cases below. The clone drops them so
+	// handlers can set fresh values without accidentally inheriting stale ones.
+	origPendingResult := agent.PendingResult
+	origForkAttributes := agent.ForkAttributes
 
-	// Clear transient fields before the handler runs so handlers can set
-	// fresh values without accidentally inheriting stale ones.
-	copy.PendingResult = nil
-	copy.PendingAskID = ""
-	copy.ForkSessionID = nil
-	copy.ForkAttributes = nil
+	// Clone — handlers must not mutate the original agent.
+	copy := cloneAgent(agent)
 
 	switch transition.Tag {
 	case "goto":
@@ -122,9 +129,7 @@ func ApplyTransition(
 			res, err = specifier.Resolve(tr.Target, copy.ScopeDir)
 		}
 		if err != nil {
-			copy.Status = wfstate.AgentStatusPaused
-			copy.Error = fmt.Sprintf("reset-workflow: %s", err.Error())
-			return TransitionResult{Agent: &copy}, nil
+			return pauseAgent(copy, "reset-workflow", err), nil
 		}
 		return HandleResetWorkflow(copy, tr, wfState, res), nil
 	case "fork-workflow":
@@ -137,15 +142,11 @@ func ApplyTransition(
 			res, err = specifier.Resolve(tr.Target, copy.ScopeDir)
 		}
 		if err != nil {
-			copy.Status = wfstate.AgentStatusPaused
-			copy.Error = fmt.Sprintf("fork-workflow: %s", err.Error())
-			return TransitionResult{Agent: &copy}, nil
+			return pauseAgent(copy, "fork-workflow", err), nil
 		}
 		result, handlerErr := HandleForkWorkflow(copy, tr, wfState, res)
 		if handlerErr != nil {
-			copy.Status = wfstate.AgentStatusPaused
-			copy.Error = fmt.Sprintf("fork-workflow: %s", handlerErr.Error())
-			return TransitionResult{Agent: &copy}, nil
+			return pauseAgent(copy, "fork-workflow", handlerErr), nil
 		}
 		return result, nil
 	case "call-workflow":
@@ -158,15 +159,11 @@ func ApplyTransition(
 			res, err = specifier.Resolve(tr.Target, copy.ScopeDir)
 		}
 		if err != nil {
-			copy.Status = wfstate.AgentStatusPaused
-			copy.Error = fmt.Sprintf("call-workflow: %s", err.Error())
-			return TransitionResult{Agent: &copy}, nil
+			return pauseAgent(copy, "call-workflow", err), nil
 		}
 		result, handlerErr := HandleCallWorkflow(copy, tr, wfState, res)
 		if handlerErr != nil {
-			copy.Status = wfstate.AgentStatusPaused
-			copy.Error = fmt.Sprintf("call-workflow: %s", handlerErr.Error())
-			return TransitionResult{Agent: &copy}, nil
+			return pauseAgent(copy, "call-workflow", handlerErr), nil
 		}
 		return result, nil
 	case "function-workflow":
@@ -179,15 +176,11 @@ func ApplyTransition(
 			res, err = specifier.Resolve(tr.Target, copy.ScopeDir)
 		}
 		if err != nil {
-			copy.Status = wfstate.AgentStatusPaused
-			copy.Error = fmt.Sprintf("function-workflow: %s", err.Error())
-			return TransitionResult{Agent: &copy}, nil
+			return pauseAgent(copy, "function-workflow", err), nil
 		}
 		result, handlerErr := HandleFunctionWorkflow(copy, tr, wfState, res)
 		if handlerErr != nil {
-			copy.Status = wfstate.AgentStatusPaused
-			copy.Error = fmt.Sprintf("function-workflow: %s", handlerErr.Error())
-			return TransitionResult{Agent: &copy}, nil
+			return pauseAgent(copy, "function-workflow", handlerErr), nil
 		}
 		return result, nil
 	case "result":
@@ -197,58 +190,55 @@ func ApplyTransition(
 	}
 }
 
-// deepCopyAgent returns a fully independent copy of a, including deep copies
-// of all pointer and reference fields.
-func deepCopyAgent(a wfstate.AgentState) wfstate.AgentState {
-	c := a // copies all value-type fields (ID, CurrentState, Cwd)
-
-	if a.SessionID != nil {
-		s := *a.SessionID
-		c.SessionID = &s
-	}
-	if a.PendingResult != nil {
-		p := *a.PendingResult
-		c.PendingResult = &p
-	}
-	if a.ForkSessionID != nil {
-		fs := *a.ForkSessionID
-		c.ForkSessionID = &fs
-	}
-	if len(a.ForkAttributes) > 0 {
-		m := make(map[string]string, len(a.ForkAttributes))
-		for k, v := range a.ForkAttributes {
-			m[k] = v
-		}
-		c.ForkAttributes = m
-	}
-
-	// Allocate a new backing array for the stack so handlers can append
-	// without aliasing the original. Skip allocation for the common empty case.
-	var newStack []wfstate.StackFrame
-	if len(a.Stack) > 0 {
-		newStack = make([]wfstate.StackFrame, len(a.Stack))
-		for i, frame := range a.Stack {
-			var session *string
-			if frame.Session != nil {
-				s := *frame.Session
-				session = &s
-			}
-			newStack[i] = wfstate.StackFrame{
-				Session:      session,
-				State:        frame.State,
-				ScopeDir:     frame.ScopeDir,
-				Cwd:          frame.Cwd,
-				NestingDepth: frame.NestingDepth,
-				ScopeURL:     frame.ScopeURL,
-				TaskFolder:   frame.TaskFolder,
-			}
-		}
-	}
-	c.Stack = newStack
+// pauseAgent returns agent paused with a validation error reported against
+// tag.
+//
+// It takes the agent by value so that only the paused result is heap-allocated:
+// taking the address of ApplyTransition's clone directly would move the clone
+// to the heap on every transition, not just the failing ones.
+func pauseAgent(agent wfstate.AgentState, tag string, err error) TransitionResult {
+	agent.Status = wfstate.AgentStatusPaused
+	agent.Error = tag + ": " + err.Error()
+	return TransitionResult{Agent: &agent}
+}
 
+// cloneAgent returns a copy of a that handlers may freely modify, with the
+// transient fields (PendingResult, PendingAskID, ForkSessionID, ForkAttributes)
+// already cleared.
+//
+// Nothing else is copied. String pointers (SessionID, frame sessions) are
+// always replaced, never written through, and the stack is copy-on-write:
+// frames are never modified in place, pops only reslice, and pushes go
+// through pushFrame, which never appends into a shared backing array.
+func cloneAgent(a *wfstate.AgentState) wfstate.AgentState {
+	c := *a
+	c.PendingResult = nil
+	c.PendingAskID = ""
+	c.ForkSessionID = nil
+	c.ForkAttributes = nil
 	return c
 }
 
+// pushFrame returns stack with frame appended. The capacity of stack is
+// clipped first so the append always allocates: stack may share its backing
+// array with the agent it was cloned from, or with sibling results popped
+// from the same stack, and writing into spare capacity would corrupt them.
+func pushFrame(stack []wfstate.StackFrame, frame wfstate.StackFrame) []wfstate.StackFrame {
+	return append(stack[:len(stack):len(stack)], frame)
+}
+
+// internState returns the canonical copy of the state name name.
+//
+// Transition targets and attributes are substrings of the agent output they
+// were parsed from, so storing them on a long-lived agent would keep that
+// whole output reachable. unique.Make stores a private copy instead, shared by
+// every agent and frame naming the same state. Copies nothing references any
+// more are reclaimed by the GC, so a long-running daemon does not accumulate
+// every state name it has seen.
+func internState(name string) string {
+	return unique.Make(name).Value()
+}
+
 // withRenderedInput returns transition unchanged when the "input" attribute is
 // absent or empty. Otherwise it renders the input value through
 // prompts.RenderPrompt with variables built from pendingResult (as "input")
@@ -303,7 +293,7 @@ func withRenderedInput(
 // Updates current_state to the transition target. Session and stack are
 // preserved unchanged.
 func HandleGoto(agent wfstate.AgentState, transition parsing.Transition) TransitionResult {
-	agent.CurrentState = transition.Target
+	agent.CurrentState = internState(transition.Target)
 	if input, ok := transition.Attributes["input"]; ok && input != "" {
 		agent.PendingResult = &input
 	}
@@ -318,7 +308,7 @@ func HandleGoto(agent wfstate.AgentState, transition parsing.Transition) Transit
 //   - Applies cd attribute if present
 //   - If task="new", increments TaskCount and computes a new TaskFolder
 func HandleReset(agent wfstate.AgentState, transition parsing.Transition, wfState *wfstate.WorkflowState) TransitionResult {
-	agent.CurrentState = transition.Target
+	agent.CurrentState = internState(transition.Target)
 	agent.SessionID = nil
 
 	if cd, ok := transition.Attributes["cd"]; ok {
@@ -397,16 +387,16 @@ func HandleFunction(agent wfstate.AgentState, transition parsing.Transition) (Tr
 
 	frame := wfstate.StackFrame{
 		Session:      agent.SessionID,
-		State:        returnState,
+		State:        internState(returnState),
 		ScopeDir:     agent.ScopeDir,
 		ScopeURL:     agent.ScopeURL,
 		Cwd:          agent.Cwd,
 		NestingDepth: agent.NestingDepth,
 		TaskFolder:   agent.TaskFolder,
 	}
-	agent.Stack = append(agent.Stack, frame)
+	agent.Stack = pushFrame(agent.Stack, frame)
 	agent.SessionID = nil
-	agent.CurrentState = transition.Target
+	agent.CurrentState = internState(transition.Target)
 	if input, ok := transition.Attributes["input"]; ok && input != "" {
 		agent.PendingResult = &input
 	}
@@ -435,16 +425,16 @@ func HandleCall(agent wfstate.AgentState, transition parsing.Transition) (Transi
 
 	frame := wfstate.StackFrame{
 		Session:      callerSession,
-		State:        returnState,
+		State:        internState(returnState),
 		ScopeDir:     agent.ScopeDir,
 		ScopeURL:     agent.ScopeURL,
 		Cwd:          agent.Cwd,
 		NestingDepth: agent.NestingDepth,
 		TaskFolder:   agent.TaskFolder,
 	}
-	agent.Stack = append(agent.Stack, frame)
+	agent.Stack = pushFrame(agent.Stack, frame)
 	agent.ForkSessionID = callerSession
-	agent.CurrentState = transition.Target
+	agent.CurrentState = internState(transition.Target)
 	if input, ok := transition.Attributes["input"]; ok && input != "" {
 		agent.PendingResult = &input
 	}
@@ -464,11 +454,7 @@ func CreateForkWorker(
 	wfState *wfstate.WorkflowState,
 ) (wfstate.AgentState, error) {
 	// Derive state abbreviation from the fork target filename.
-	stateName := strings.ToLower(parsing.ExtractStateName(transition.Target))
-	stateAbbrev := stateName
-	if len(stateAbbrev) > 6 {
-		stateAbbrev = stateAbbrev[:6]
-	}
+	stateAbbrev := forkStateAbbrev(transition.Target)
 
 	// Allocate a unique worker ID using persistent per-parent counters.
 	if wfState.ForkCounters == nil {
@@ -476,12 +462,12 @@ func CreateForkWorker(
 	}
 	wfState.ForkCounters[agent.ID]++
 	counter := wfState.ForkCounters[agent.ID]
-	workerID := fmt.Sprintf("%s_%s%d", agent.ID, stateAbbrev, counter)
+	workerID := agent.ID + "_" + stateAbbrev + strconv.Itoa(counter)
 
 	// Build the worker agent.
 	worker := wfstate.AgentState{
 		ID:           workerID,
-		CurrentState: transition.Target,
+		CurrentState: internState(transition.Target),
 		SessionID:    nil,
 		Stack:        []wfstate.StackFrame{},
 		ScopeDir:     agent.ScopeDir,
@@ -493,15 +479,16 @@ func CreateForkWorker(
 	}
 
 	// Collect fork attributes (exclude "next", "cd", "input", and "task").
-	forkAttrs := make(map[string]string)
+	// The map is allocated on the first pass-through attribute, so the common
+	// <fork next="..."> with only reserved attributes allocates nothing.
 	for k, v := range transition.Attributes {
 		if k != "next" && k != "cd" && k != "input" && k != "task" {
-			forkAttrs[k] = v
+			if worker.ForkAttributes == nil {
+				worker.ForkAttributes = make(map[string]string, len(transition.Attributes))
+			}
+			worker.ForkAttributes[k] = v
 		}
 	}
-	if len(forkAttrs) > 0 {
-		worker.ForkAttributes = forkAttrs
-	}
 
 	// Set task folder: inherit from parent or compute a new one.
 	if transition.Attributes["task"] == "inherit" {
@@ -520,6 +507,28 @@ func CreateForkWorker(
 	return worker, nil
 }
 
+// forkStateAbbrev returns the first 6 bytes of the lowercased state name of
+// target, used in fork worker IDs.
+//
+// ASCII lowercasing preserves byte length, so when the first 6 bytes are
+// ASCII the prefix is cut before lowercasing and only those bytes are
+// converted. Otherwise the whole name is lowercased first, as a multi-byte
+// rune may change length when lowercased.
+func forkStateAbbrev(target string) string {
+	name := parsing.ExtractStateName(target)
+	if len(name) > 6 {
+		prefix := name[:6]
+		for i := 0; i < len(prefix); i++ {
+			if prefix[i] >= utf8.RuneSelf {
+				name = strings.ToLower(name)
+				return name[:min(len(name), 6)]
+			}
+		}
+		name = prefix
+	}
+	return strings.ToLower(name)
+}
+
 // HandleFork handles the <fork> transition tag.
 //
 // Spawns an independent worker agent while the parent continues:
@@ -557,7 +566,7 @@ func HandleFork(
 	}
 
 	// Advance parent to next state; session and stack are preserved.
-	agent.CurrentState = nextState
+	agent.CurrentState = internState(nextState)
 
 	return TransitionResult{Agent: &agent, Worker: &worker}, nil
 }
@@ -582,7 +591,7 @@ func CreateForkWorkflowWorker(
 	counterKey := agent.ID + "_" + resolution.Abbrev
 	ws.ForkCounters[counterKey]++
 	counter := ws.ForkCounters[counterKey]
-	workerID := fmt.Sprintf("%s_%s%d", agent.ID, resolution.Abbrev, counter)
+	workerID := counterKey + strconv.Itoa(counter)
 
 	// Determine worker Cwd: inherit caller's unless overridden by "cd" attribute.
 	workerCwd := agent.Cwd
@@ -655,7 +664,7 @@ func HandleForkWorkflow(
 
 	// Advance caller to "next" state when present; otherwise leave it unchanged.
 	if next, ok := transition.Attributes["next"]; ok {
-		agent.CurrentState = next
+		agent.CurrentState = internState(next)
 	}
 
 	return TransitionResult{Agent: &agent, Worker: &worker}, nil
@@ -706,14 +715,14 @@ func HandleCallWorkflow(
 
 	frame := wfstate.StackFrame{
 		Session:      callerSession,
-		State:        returnState,
+		State:        internState(returnState),
 		ScopeDir:     agent.ScopeDir,
 		ScopeURL:     agent.ScopeURL,
 		Cwd:          agent.Cwd,
 		NestingDepth: agent.NestingDepth,
 		TaskFolder:   agent.TaskFolder,
 	}
-	agent.Stack = append(agent.Stack, frame)
+	agent.Stack = pushFrame(agent.Stack, frame)
 	agent.NestingDepth = agent.NestingDepth + 1
 	agent.ForkSessionID = callerSession
 	agent.SessionID = nil
@@ -762,14 +771,14 @@ func HandleFunctionWorkflow(
 
 	frame := wfstate.StackFrame{
 		Session:      agent.SessionID,
-		State:        returnState,
+		State:        internState(returnState),
 		ScopeDir:     agent.ScopeDir,
 		ScopeURL:     agent.ScopeURL,
 		Cwd:          agent.Cwd,
 		NestingDepth: agent.NestingDepth,
 		TaskFolder:   agent.TaskFolder,
 	}
-	agent.Stack = append(agent.Stack, frame)
+	agent.Stack = pushFrame(agent.Stack, frame)
 	agent.NestingDepth = agent.NestingDepth + 1
 	agent.SessionID = nil
 	agent.ScopeDir = resolution.ScopeDir
@@ -801,15 +810,10 @@ func HandleResult(
 	wfState *wfstate.WorkflowState,
 ) TransitionResult {
 	if len(agent.Stack) == 0 {
-		// Agent terminates — store payload for orchestrator consumption.
-		if wfState.AgentTerminationResults == nil {
-			wfState.AgentTerminationResults = make(map[string]string)
-		}
-		wfState.AgentTerminationResults[agent.ID] = transition.Payload
-		return TransitionResult{}
+		return terminate(agent.ID, transition.Payload, wfState)
 	}
 
-	// Pop top frame (LIFO).
+	// Pop top frame (LIFO). Reslicing leaves the shared backing array intact.
 	frame := agent.Stack[len(agent.Stack)-1]
 	agent.Stack = agent.Stack[:len(agent.Stack)-1]
 
@@ -841,6 +845,17 @@ func HandleResult(
 	return TransitionResult{Agent: &agent}
 }
 
+// terminate records payload as the termination result of agentID and returns
+// the termination outcome (nil Agent and Worker).
+func terminate(agentID, payload string, wfState *wfstate.WorkflowState) TransitionResult {
+	// Store payload for orchestrator consumption.
+	if wfState.AgentTerminationResults == nil {
+		wfState.AgentTerminationResults = make(map[string]string)
+	}
+	wfState.AgentTerminationResults[agentID] = payload
+	return TransitionResult{}
+}
+
 // HandleAsk handles the <ask> transition tag.
 //
 // Pauses the agent until external input arrives:
@@ -869,7 +884,7 @@ func HandleAsk(
 
 	agent.Status = wfstate.AgentStatusAsking
 	agent.AskPrompt = transition.Payload
-	agent.AskNextState = transition.Target
+	agent.AskNextState = internState(transition.Target)
 	agent.AskTimeout = transition.Attributes["timeout"]
 	agent.AskTimeoutNext = transition.Attributes["timeout_next"]
 	agent.AskID = fmt.Sprintf("ask_%s_%d", agent.ID, time.Now().UnixNano())
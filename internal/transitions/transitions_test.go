@@ -51,6 +51,53 @@ func TestApplyTransitionDeepCopiesAgent(t *testing.T) {
 	assert.Equal(t, "NEXT.md", result.Agent.CurrentState)
 }
 
+func TestApplyTransitionDoesNotShareStackBackingArray(t *testing.T) {
+	// Spare capacity in the original stack must not let a push in the handler
+	// write into the caller's backing array.
+	original := makeAgent("main", "START.md", strPtr("session_123"))
+	original.Stack = make([]wfstate.StackFrame, 1, 4)
+	original.Stack[0] = wfstate.StackFrame{Session: strPtr("outer"), State: "OUTER.md"}
+	tr := parsing.Transition{
+		Tag:        "function",
+		Target:     "EVAL.md",
+		Attributes: map[string]string{"return": "NEXT.md"},
+	}
+
+	result, err := transitions.ApplyTransition(&original, tr, &wfstate.WorkflowState{}, nil)
+
+	require.NoError(t, err)
+	require.Len(t, result.Agent.Stack, 2)
+	result.Agent.Stack[0].State = "CHANGED.md"
+	assert.Equal(t, "OUTER.md", original.Stack[0].State)
+	assert.Empty(t, original.Stack[:2][1].State, "push must not land in the caller's spare capacity")
+}
+
+func TestApplyTransitionPushAfterPopDoesNotOverwriteOriginalStack(t *testing.T) {
+	// A result pop shares the original's backing array; pushing onto the
+	// popped stack must not overwrite the frame the original still holds.
+	original := makeAgent("main", "CHILD.md", strPtr("child"))
+	original.Stack = []wfstate.StackFrame{
+		{Session: strPtr("outer"), State: "OUTER.md"},
+		{Session: strPtr("caller"), State: "RETURN.md"},
+	}
+	wfState := &wfstate.WorkflowState{}
+
+	popped, err := transitions.ApplyTransition(&original, parsing.Transition{Tag: "result", Payload: "done"}, wfState, nil)
+	require.NoError(t, err)
+	require.Len(t, popped.Agent.Stack, 1)
+
+	pushed, err := transitions.ApplyTransition(popped.Agent, parsing.Transition{
+		Tag:        "call",
+		Target:     "OTHER.md",
+		Attributes: map[string]string{"return": "AFTER.md"},
+	}, wfState, nil)
+	require.NoError(t, err)
+
+	require.Len(t, pushed.Agent.Stack, 2)
+	assert.Equal(t, "AFTER.md", pushed.Agent.Stack[1].State)
+	assert.Equal(t, "RETURN.md", original.Stack[1].State)
+}
+
 func TestApplyTransitionClearsPendingResult(t *testing.T) {
 	agent := makeAgent("main", "START.md", strPtr("session_123"))
 	agent.PendingResult = strPtr("previous result")
@@ -626,6 +673,25 @@ func TestForkWorkerIDShortStateName(t *testing.T) {
 	assert.Equal(t, "main_run1", result.Worker.ID)
 }
 
+func TestForkWorkerIDAbbrevLowercasesMixedCaseAndNonASCII(t *testing.T) {
+	cases := map[string]string{
+		"ReviewCode.MD": "main_review1",
+		"ÉTUDIER.md":    "main_étudi1", // É is two bytes, so six bytes hold five runes
+	}
+	for target, want := range cases {
+		agent := makeAgent("main", "START.md", strPtr("session_123"))
+		tr := parsing.Transition{
+			Tag: "fork", Target: target,
+			Attributes: map[string]string{"next": "NEXT.md"},
+		}
+
+		result, err := transitions.ApplyTransition(&agent, tr, &wfstate.WorkflowState{}, nil)
+
+		require.NoError(t, err)
+		assert.Equal(t, want, result.Worker.ID, target)
+	}
+}
+
 func TestForkWorkerHasEmptyStack(t *testing.T) {
 	agent := makeAgent("main", "START.md", strPtr("session_123"))
 	tr := parsing.Transition{
@@ -3437,4 +3503,3 @@ func TestApplyTransitionAskClearsPendingResult(t *testing.T) {
 	require.NoError(t, err)
 	assert.Nil(t, result.Agent.PendingResult)
 }
-